@@ -37,6 +37,12 @@ class _DataLoader:
         """
         self.cache = None
 
+    def restore(self, data):
+        """
+        Restore cache with data preloaded before.
+        """
+        self.cache = data
+
     def preload(self, data_name):
         """
         Preload data from problem of specified module.
@@ -103,3 +109,10 @@ def reset():
     Reset cache.
     """
     _data_loader.reset()
+
+
+def restore(data):
+    """
+    Restore cache with data preloaded before.
+    """
+    _data_loader.restore(data)
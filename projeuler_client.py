@@ -0,0 +1,91 @@
+# coding: utf-8
+
+
+"""
+Client of run server, light enough to run before the runner is imported.
+"""
+
+
+from __future__ import annotations
+
+import os
+import sys
+
+
+# under CACHE_DIR of runner
+SERVE_SOCKET = os.path.join(".projeuler", "serve.sock")
+
+# key of clients of run server, readable by its user only
+SERVE_KEY = os.path.join(".projeuler", "serve.key")
+
+
+def serve_client(
+    command: str, argv: list[str], path: str = SERVE_SOCKET, key_path: str = SERVE_KEY
+):
+    """
+    Connect to run server and send it a command, return the connection, or
+    None if no server is running.
+    """
+    if sys.platform == "win32" or not os.path.exists(path):
+        return None
+
+    # multiprocessing is imported only when a server may be up
+    from multiprocessing import AuthenticationError
+    from multiprocessing.connection import Client
+
+    try:
+        with open(key_path, "rb") as f:
+            authkey = f.read()
+
+        conn = Client(path, family="AF_UNIX", authkey=authkey)
+
+    except (OSError, AuthenticationError):
+        return None
+
+    conn.send((command, argv, sys.stdout.isatty()))
+    return conn
+
+
+def run_on_server(argv: list[str]) -> None:
+    """
+    Run on run server if it is up with the same worker settings, exit with
+    its result; return if the run should be done locally.
+    """
+    conn = serve_client("run", argv)
+    if conn is None:
+        return
+
+    try:
+        while True:
+            command, value = conn.recv()
+            if command == "out":
+                sys.stdout.write(value)
+                sys.stdout.flush()
+
+            elif command == "err":
+                sys.stderr.write(value)
+
+            elif command == "exit":
+                sys.exit(value)
+
+            elif command == "local":
+                # not a run for server, or invalid arguments reported locally
+                return
+
+            elif command == "stale":
+                print("Run server stopped since its code changed, run locally")
+                return
+
+            else:
+                print("Run server has other worker settings, run locally")
+                return
+
+    except EOFError:
+        print("Run server is lost, run locally")
+
+    except KeyboardInterrupt:
+        print("Interrupted by user")
+        sys.exit(1)
+
+    finally:
+        conn.close()
@@ -0,0 +1,6288 @@
+# coding: utf-8
+
+
+"""
+Runner of all problem solutions, see projeuler.py for main entry.
+"""
+
+
+from __future__ import annotations
+
+import os
+import sys
+import ast
+import json
+import math
+import re
+import glob
+import html
+import io
+import zlib
+import hashlib
+import linecache
+import ctypes
+import gc
+import platform
+import inspect
+import importlib
+import argparse
+import atexit
+import cProfile
+import pstats
+import sqlite3
+import subprocess
+import time
+import queue
+import statistics
+import signal
+import threading
+import traceback
+import tracemalloc
+import collections
+import contextlib
+import copy
+import heapq
+import multiprocessing
+
+from datetime import datetime
+from multiprocessing.connection import Client, Listener
+from multiprocessing.pool import RemoteTraceback
+from typing import (
+    cast,
+    AsyncIterator,
+    Callable,
+    Iterable,
+    Iterator,
+    Mapping,
+)
+
+
+import data
+
+from projeuler_client import SERVE_KEY, SERVE_SOCKET, serve_client
+
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+if sys.platform == "win32":
+    from ctypes import wintypes
+
+    WIN_DLL = ctypes.LibraryLoader(ctypes.WinDLL)
+else:
+    WIN_DLL = None
+
+
+PROBLEM_DIR = "problems"
+
+DATA_DIR = "data"
+
+CACHE_DIR = ".projeuler"
+
+INDEX_FILE = os.path.join(CACHE_DIR, "index.json")
+
+HISTORY_FILE = os.path.join(CACHE_DIR, "history.sqlite3")
+
+RUN_CACHE_FILE = os.path.join(CACHE_DIR, "runcache.json")
+
+PROFILE_DIR = os.path.join(CACHE_DIR, "profile")
+
+SAMPLE_DIR = os.path.join(CACHE_DIR, "sample")
+
+POSTMORTEM_DIR = os.path.join(CACHE_DIR, "postmortem")
+
+TRACE_ALLOC_DIR = os.path.join(CACHE_DIR, "alloc")
+
+# tracemalloc slows methods down by an order of magnitude, timeouts are
+# multiplied by this while tracing allocations
+TRACE_ALLOC_TIMEOUT_SCALE = 20.0
+
+# how often run --watch checks files for changes, in seconds
+WATCH_INTERVAL = 0.5
+
+GC_MODES = ("on", "off", "freeze")
+
+# environment variable of the key shared by runner and worker agents
+AUTHKEY_ENV = "PROJEULER_AUTHKEY"
+
+POSTMORTEM_TIME = 200.0
+
+POSTMORTEM_INTERVAL = 2.0
+
+# time costs are noisy when the runner runs more jobs than usable CPUs; when
+# CPUs are busy over NOISE_BUSY and processes other than the runner take
+# over NOISE_OTHERS CPUs, more than starting a client of run server takes on
+# a single CPU host; when any of these is exceeded while measuring: ratio of
+# stolen and iowait CPU time, coefficient of variation of benchmark samples;
+# or when the fastest CPU runs below this ratio of its maximum frequency
+NOISE_BUSY = 0.9
+NOISE_OTHERS = 0.25
+NOISE_STEAL = 0.05
+NOISE_IOWAIT = 0.1
+NOISE_COV = 0.1
+NOISE_FREQ = 0.8
+
+
+def _win_get_curse_position(handle) -> tuple[int, int]:
+    if sys.platform != "win32":
+        return 0, 0
+
+    class _ScreenBufferInfo(ctypes.Structure):
+        # pylint: disable=too-few-public-methods, protected-access, used-before-assignment
+        _fields_ = [
+            ("dwSize", wintypes._COORD),
+            ("dwCursorPosition", wintypes._COORD),
+            ("wAttributes", wintypes.WORD),
+            ("srWindow", wintypes.SMALL_RECT),
+            ("dwMaximumWindowSize", wintypes._COORD),
+        ]
+
+    win32api_get_screen_buffer_info = WIN_DLL.kernel32.GetConsoleScreenBufferInfo
+    win32api_get_screen_buffer_info.argtypes = [
+        wintypes.HANDLE,
+        ctypes.POINTER(_ScreenBufferInfo),
+    ]
+    win32api_get_screen_buffer_info.restype = wintypes.BOOL
+
+    info = _ScreenBufferInfo()
+    win32api_get_screen_buffer_info(handle, ctypes.byref(info))
+    x = cast(int, info.dwCursorPosition.X)
+    y = cast(int, info.dwCursorPosition.Y)
+    return x, y
+
+
+IS_WINDOWS_LEGACY_TERMINAL = False
+if sys.platform == "win32":
+    _Win32APIGetStdHandle = WIN_DLL.kernel32.GetStdHandle
+    _Win32APIGetStdHandle.argtypes = [wintypes.DWORD]
+    _Win32APIGetStdHandle.restype = wintypes.HANDLE
+
+    _handle = cast(wintypes.HANDLE, _Win32APIGetStdHandle(-11))
+    _x0, _ = _win_get_curse_position(_handle)
+    print("\033[D", end="", flush=True)  # move cursor to left
+    _x1, _ = _win_get_curse_position(_handle)
+    if _x1 - _x0 > 1:
+        IS_WINDOWS_LEGACY_TERMINAL = True
+        print("\b" * (_x1 - _x0), end="", flush=True)
+
+
+class ProblemId:
+    """
+    Problem ID.
+    """
+
+    pid: int
+    method: str
+
+    def __init__(self, pid: int | str):
+        if isinstance(pid, str):
+            if "." in pid:
+                pid, method = pid.split(".")
+                self.pid = int(pid)
+                self.method = method
+            else:
+                self.pid = int(pid)
+                self.method = None
+
+        elif isinstance(pid, int):
+            self.pid = pid
+            self.method = None
+
+    def __eq__(self, other: ProblemId | int) -> bool:
+        if isinstance(other, int):
+            return self.pid == other
+
+        if isinstance(other, ProblemId):
+            return self.pid == other.pid and self.method == other.method
+
+        return False
+
+    def problem_name(self) -> str:
+        """
+        Get the filename of this problem.
+        """
+        return f"p{self.pid:04d}"
+
+
+class RunConfigure:
+    """
+    Run configuration.
+    """
+
+    check: bool
+    strict: bool
+    timeout: float
+    preload: bool
+    jobs: int
+    backend: str
+    workers: list[tuple[str, int]] | None
+    authkey: str | None
+    pin: list[int] | None
+    nice: int
+    mem_limit: int
+    adaptive_timeout: bool
+    timeout_multiple: float
+    timeout_floor: float
+    timeout_ceiling: float
+    show_schedule: bool
+    budget: float
+    race: bool
+    shard: tuple[int, int] | None
+    timings: dict[tuple[int, str], float] | None
+    json: str | None
+    watch: bool
+    history: bool
+    incremental: bool
+    profile: str | None
+    sample: str | None
+    sample_interval: float
+    flamegraph: bool
+    postmortem: str | None
+    rusage: bool
+    trace_alloc: str | None
+    gc: str
+    top: int
+    id_list: Iterable[ProblemId]
+
+    def __init__(self):
+        self.check = False
+        self.strict = False
+        self.timeout = 5000.0
+        self.preload = True
+        self.jobs = 1
+        self.backend = "pool"
+        self.workers = None
+        self.authkey = None
+        self.pin = None
+        self.nice = 0
+        self.mem_limit = 0
+        self.adaptive_timeout = False
+        self.timeout_multiple = 3.0
+        self.timeout_floor = 1000.0
+        self.timeout_ceiling = 60000.0
+        self.show_schedule = False
+        self.budget = 0.0
+        self.race = False
+        self.shard = None
+        self.timings = None
+        self.json = None
+        self.watch = False
+        self.history = True
+        self.incremental = False
+        self.profile = None
+        self.sample = None
+        self.sample_interval = 5.0
+        self.flamegraph = False
+        self.postmortem = POSTMORTEM_DIR
+        self.rusage = False
+        self.trace_alloc = None
+        self.gc = "on"
+        self.top = 5
+        self.id_list = []
+
+    @staticmethod
+    def from_parser(result: argparse.Namespace) -> RunConfigure:
+        """
+        Create a run configuration from parser result, raise ValueError on
+        conflicting options.
+        """
+        conf = RunConfigure()
+        conf.check = result.check
+        conf.strict = result.strict
+        conf.timeout = result.timeout
+        conf.preload = not result.no_preload
+        conf.pin = result.pin
+        conf.nice = result.nice
+        conf.jobs = result.jobs or len(conf.pin or []) or usable_cpu_count()
+        conf.backend = result.backend or (
+            KEPT_BACKEND if getattr(result, "watch", False) else "pool"
+        )
+        conf.workers = result.workers
+        conf.authkey = result.authkey
+        conf.mem_limit = result.mem_limit
+        conf.adaptive_timeout = getattr(result, "adaptive_timeout", False)
+        conf.timeout_multiple = getattr(result, "timeout_multiple", 3.0)
+        conf.timeout_floor = getattr(result, "timeout_floor", 1000.0)
+        conf.timeout_ceiling = getattr(result, "timeout_ceiling", 60000.0)
+        conf.show_schedule = getattr(result, "show_schedule", False)
+        conf.budget = getattr(result, "budget", 0.0)
+        conf.race = getattr(result, "race", False)
+        conf.shard = getattr(result, "shard", None)
+        conf.timings = getattr(result, "timings", None)
+        conf.json = getattr(result, "json", None)
+        conf.watch = getattr(result, "watch", False)
+        conf.history = not result.no_history
+        conf.gc = result.gc
+        conf.id_list = result.id
+        conf.incremental = getattr(result, "incremental", False)
+        conf.profile = getattr(result, "profile_dir", None) or (
+            PROFILE_DIR if getattr(result, "profile", False) else None
+        )
+        conf.sample = getattr(result, "sample_dir", None) or (
+            SAMPLE_DIR if getattr(result, "sample", False) else None
+        )
+        conf.sample_interval = getattr(result, "sample_interval", 5.0)
+        conf.flamegraph = getattr(result, "flamegraph", False)
+        if getattr(result, "no_postmortem", False):
+            conf.postmortem = None
+        conf.rusage = getattr(result, "rusage", False)
+        conf.trace_alloc = getattr(result, "trace_alloc_dir", None) or (
+            TRACE_ALLOC_DIR if getattr(result, "trace_alloc", False) else None
+        )
+        conf.top = getattr(result, "top", 5)
+        if result.no_timeout:
+            conf.timeout = 0.0
+        if conf.race and (conf.budget > 0.0 or conf.show_schedule):
+            # racing methods are dispatched together, not by schedule
+            raise ValueError("--race cannot be used with --budget or --show-schedule")
+        return conf
+
+    def is_noise_controlled(self) -> bool:
+        """
+        Are worker processes pinned to CPUs or reniced.
+        """
+        return self.pin is not None or self.nice != 0
+
+    def is_instrumented(self) -> bool:
+        """
+        Are methods measured by instruments which distort their time cost,
+        timed with a non-default garbage collector mode, or raced against each
+        other, such runs are neither recorded to history nor cached.
+        """
+        return bool(self.profile or self.trace_alloc) or self.gc != "on" or self.race
+
+    def make_job(self, module_name: str, func_name: str) -> Job:
+        """
+        Make a job to run a method.
+        """
+        job = Job(module_name, func_name)
+        job.preload = self.preload
+        job.profile = self.profile
+        job.sample = self.sample
+        job.sample_interval = self.sample_interval
+        job.flamegraph = self.flamegraph
+        job.postmortem = self.postmortem
+        job.trace_alloc = self.trace_alloc
+        job.gc = self.gc
+        job.top = self.top
+        return job
+
+
+class BenchConfigure(RunConfigure):
+    """
+    Benchmark configuration.
+    """
+
+    warmup: int
+    repeat: int
+    min_time: float
+
+    def __init__(self):
+        super().__init__()
+        self.timeout = 60000.0
+        self.warmup = 1
+        self.repeat = 5
+        self.min_time = 200.0
+
+    @staticmethod
+    def from_parser(result: argparse.Namespace) -> BenchConfigure:
+        """
+        Create a benchmark configuration from parser result.
+        """
+        conf = BenchConfigure()
+        conf.__dict__.update(RunConfigure.from_parser(result).__dict__)
+        conf.warmup = max(0, result.warmup)
+        conf.repeat = result.repeat
+        conf.min_time = result.min_time
+        return conf
+
+    def make_job(self, module_name: str, func_name: str) -> Job:
+        job = BenchJob(module_name, func_name)
+        job.preload = self.preload
+        job.warmup = self.warmup
+        job.repeat = self.repeat
+        job.min_time = self.min_time
+        job.gc = self.gc
+        return job
+
+
+def usable_cpu_count() -> int:
+    """
+    Get number of CPUs usable by this process.
+    """
+    if hasattr(os, "sched_getaffinity"):
+        return max(1, len(os.sched_getaffinity(0)))
+
+    return max(1, os.cpu_count() or 1)
+
+
+def _positive_int(value: str) -> int:
+    result = int(value)
+    if result < 1:
+        raise argparse.ArgumentTypeError(f"invalid positive value: '{value}'")
+
+    return result
+
+
+def _shard(value: str) -> tuple[int, int]:
+    """
+    Shard like `2/4`, the second of four shards.
+    """
+    try:
+        index, count = (int(part) for part in value.split("/"))
+
+    except ValueError as ex:
+        raise argparse.ArgumentTypeError(f"invalid shard: '{value}'") from ex
+
+    if count < 1 or not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(f"invalid shard: '{value}'")
+
+    return index, count
+
+
+def _timings(value: str) -> dict[tuple[int, str], float]:
+    """
+    Time costs of successful methods by (problem, method) in JSON results
+    written by run --json.
+    """
+    try:
+        with open(value, encoding="utf-8") as f:
+            content = json.load(f)
+
+        return {
+            (entry["pid"], method["name"]): method["time_cost"]
+            for entry in content["problems"]
+            for method in entry["methods"]
+            if method["status"] in History.SUCCESS_STATUS
+        }
+
+    except (OSError, ValueError, KeyError, TypeError) as ex:
+        raise argparse.ArgumentTypeError(f"invalid timings: {ex}") from ex
+
+
+def _address(value: str) -> tuple[str, int]:
+    """
+    Network address like `host:port`, or `[::1]:port` for IPv6.
+    """
+    host, sep, port = value.rpartition(":")
+    if sep == "" or host == "" or not port.isdigit() or not 0 < int(port) < 65536:
+        raise argparse.ArgumentTypeError(f"invalid address: '{value}'")
+
+    return host.strip("[]"), int(port)
+
+
+def _address_list(value: str) -> list[tuple[str, int]]:
+    return [_address(item.strip()) for item in value.split(",") if item.strip()]
+
+
+def _cpu_list(value: str) -> list[int]:
+    """
+    List of CPUs like `0,2,4` or `0-3`.
+    """
+    if not hasattr(os, "sched_setaffinity"):
+        raise argparse.ArgumentTypeError(
+            "CPU pinning is not supported on this platform"
+        )
+
+    result = []
+    try:
+        for part in value.split(","):
+            if "-" in part:
+                first, last = part.split("-", 1)
+                result += range(int(first), int(last) + 1)
+            else:
+                result.append(int(part))
+
+    except ValueError as ex:
+        raise argparse.ArgumentTypeError(f"invalid CPU list: '{value}'") from ex
+
+    usable = os.sched_getaffinity(0)
+    for cpu in result:
+        if cpu not in usable:
+            raise argparse.ArgumentTypeError(f"CPU {cpu} is not usable")
+
+    if len(result) == 0:
+        raise argparse.ArgumentTypeError(f"invalid CPU list: '{value}'")
+
+    return result
+
+
+class _TimeSpanInMs(float):
+    """
+    Time span in milliseconds.
+    """
+
+    def __new__(cls, value: float | str):
+        if isinstance(value, str):
+            if value.endswith("ms"):
+                value = float(value[0:-2])
+
+            elif value.endswith("s"):
+                value = float(value[0:-1]) * 1000.0
+
+            else:
+                value = float(value)
+
+        return super().__new__(cls, value)
+
+
+class _SizeInBytes(int):
+    """
+    Size in bytes, or with unit like 512K, 512M, 2G.
+    """
+
+    UNITS = {"K": 1024, "M": 1024**2, "G": 1024**3, "T": 1024**4}
+
+    def __new__(cls, value: int | str):
+        if isinstance(value, str):
+            value = value.strip().upper().removesuffix("B")
+            if value[-1:] in cls.UNITS:
+                value = int(float(value[0:-1]) * cls.UNITS[value[-1]])
+
+            else:
+                value = int(value)
+
+        return super().__new__(cls, value)
+
+
+def _get_parser():
+    parser = argparse.ArgumentParser(description="Project Euler problem runner")
+
+    subparsers = parser.add_subparsers(dest="command", help="sub-command help")
+
+    cmd_list = subparsers.add_parser("list", help="list all problems")
+    cmd_list.add_argument(
+        "-f", "--full", action="store_true", help="show full information"
+    )
+    cmd_list.add_argument(
+        "id", nargs="*", type=ProblemId, help="show specific problem information"
+    )
+
+    cmd_create = subparsers.add_parser("create", help="create solutions of problems")
+    cmd_create.add_argument("id", nargs="*", type=int, help="create specific problems")
+
+    cmd_run = subparsers.add_parser("run", help="run problems")
+    cmd_run.add_argument(
+        "-c", "--check", action="store_true", help="check the solution answer"
+    )
+    cmd_run.add_argument(
+        "--strict",
+        action="store_true",
+        help="run check in strict mode, all methods MUST be correct",
+    )
+    cmd_run.add_argument(
+        "-i",
+        "--incremental",
+        action="store_true",
+        help="reuse cached results of methods whose source and data are unchanged",
+    )
+    cmd_run.add_argument(
+        "--profile",
+        action="store_true",
+        help="profile each method with cProfile, and save pstats files",
+    )
+    cmd_run.add_argument(
+        "--profile-dir",
+        default=None,
+        metavar="DIR",
+        help=f"save pstats files into DIR, implies --profile, default is {PROFILE_DIR}",
+    )
+    cmd_run.add_argument(
+        "--sample",
+        action="store_true",
+        help="profile each method with a low overhead sampling profiler, and save "
+        + "collapsed stacks",
+    )
+    cmd_run.add_argument(
+        "--sample-dir",
+        default=None,
+        metavar="DIR",
+        help="save collapsed stacks into DIR, implies --sample, default is "
+        + f"{SAMPLE_DIR}",
+    )
+    cmd_run.add_argument(
+        "--sample-interval",
+        type=_TimeSpanInMs,
+        default=5.0,
+        help="interval of sampling profiler, default 5ms",
+    )
+    cmd_run.add_argument(
+        "--flamegraph",
+        action="store_true",
+        help="also save flamegraph SVG files of sampling profiler",
+    )
+    cmd_run.add_argument(
+        "--trace-alloc",
+        action="store_true",
+        help="trace memory allocations of methods with tracemalloc, and save "
+        + "snapshots near peak",
+    )
+    cmd_run.add_argument(
+        "--trace-alloc-dir",
+        default=None,
+        metavar="DIR",
+        help="save snapshots into DIR, implies --trace-alloc, default is "
+        + f"{TRACE_ALLOC_DIR}",
+    )
+    cmd_run.add_argument(
+        "--rusage",
+        action="store_true",
+        help="show CPU time, peak RSS, page faults, context switches and garbage "
+        + "collections of methods",
+    )
+    cmd_run.add_argument(
+        "--adaptive-timeout",
+        action="store_true",
+        help="set timeout of each method from its history, as a multiple of "
+        + f"the {AdaptiveTimeout.PERCENTILE}th percentile of its successful "
+        + "time costs, methods without history keep the static timeout",
+    )
+    cmd_run.add_argument(
+        "--timeout-multiple",
+        type=float,
+        default=3.0,
+        help="multiple of adaptive timeout, default is 3.0",
+    )
+    cmd_run.add_argument(
+        "--timeout-floor",
+        type=_TimeSpanInMs,
+        default=1000.0,
+        help="minimum adaptive timeout, default is 1s",
+    )
+    cmd_run.add_argument(
+        "--timeout-ceiling",
+        type=_TimeSpanInMs,
+        default=60000.0,
+        help="maximum adaptive timeout, default is 1m",
+    )
+    cmd_run.add_argument(
+        "--budget",
+        type=_TimeSpanInMs,
+        default=0.0,
+        help="run only methods predicted to fit in this wall-clock time, like "
+        + "30s, changed problems first, then methods never run, then the "
+        + "fastest correct method of each problem, others are skipped",
+    )
+    cmd_run.add_argument(
+        "--race",
+        action="store_true",
+        help="run all methods of a problem at the same time, and cancel the "
+        + "others once one matches ANSWER, or a majority agree without ANSWER",
+    )
+    cmd_run.add_argument(
+        "--shard",
+        type=_shard,
+        default=None,
+        metavar="I/N",
+        help="run only the I-th of N shards, methods are dealt to shards by "
+        + "--timings, or by TIMEOUT_EXT of problems",
+    )
+    cmd_run.add_argument(
+        "--timings",
+        type=_timings,
+        default=None,
+        metavar="FILE",
+        help="partition shards so that they have about the same time cost by "
+        + "FILE, JSON results of a previous run shared by all shards",
+    )
+    cmd_run.add_argument(
+        "--json",
+        default=None,
+        metavar="FILE",
+        help="also write results to FILE as JSON, which can be merged by "
+        + "the merge command",
+    )
+    cmd_run.add_argument(
+        "--watch",
+        action="store_true",
+        help="keep workers after the run, and run again problems whose files "
+        + "in problems/ or data/ change",
+    )
+    cmd_run.add_argument(
+        "--no-serve",
+        action="store_true",
+        help="run locally even if the run server is up",
+    )
+    cmd_run.add_argument(
+        "--show-schedule",
+        action="store_true",
+        help="show methods in dispatch order, longest expected first, with "
+        + "their predicted time costs",
+    )
+    cmd_run.add_argument(
+        "--no-postmortem",
+        action="store_true",
+        help="do not capture stack and samples of a timeout method before "
+        + f"killing it, which are saved in {POSTMORTEM_DIR} by default",
+    )
+    cmd_run.add_argument(
+        "--top",
+        type=_positive_int,
+        default=5,
+        help="number of top entries to show in reports of each method",
+    )
+    _add_worker_arguments(cmd_run, timeout=5000.0, jobs=None)
+    cmd_run.add_argument("id", nargs="*", type=ProblemId, help="run specific problems")
+
+    cmd_bench = subparsers.add_parser("bench", help="benchmark problems")
+    cmd_bench.add_argument(
+        "-w",
+        "--warmup",
+        type=int,
+        default=1,
+        help="number of warmup calls before timing",
+    )
+    cmd_bench.add_argument(
+        "-r",
+        "--repeat",
+        type=_positive_int,
+        default=5,
+        help="number of timing samples of each method",
+    )
+    cmd_bench.add_argument(
+        "--min-time",
+        type=_TimeSpanInMs,
+        default=200.0,
+        help="minimum duration of each sample, methods are called in loops "
+        + "until a sample lasts this long, in milliseconds or with unit",
+    )
+    _add_worker_arguments(cmd_bench, timeout=60000.0, jobs=1)
+    cmd_bench.add_argument(
+        "id", nargs="*", type=ProblemId, help="benchmark specific problems"
+    )
+    cmd_bench.set_defaults(check=False, strict=False)
+
+    cmd_history = subparsers.add_parser(
+        "history", help="show timing history and find regressions"
+    )
+    cmd_history.add_argument(
+        "-n", "--limit", type=_positive_int, default=20, help="number of runs to show"
+    )
+    cmd_history.add_argument(
+        "--kind",
+        choices=["run", "bench"],
+        default="run",
+        help="show history of 'run' or 'bench' command",
+    )
+    cmd_history.add_argument(
+        "--window",
+        type=_positive_int,
+        default=5,
+        help="number of previous runs as rolling baseline",
+    )
+    cmd_history.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="relative slowdown from baseline to be a regression, default 0.25",
+    )
+    cmd_history.add_argument(
+        "--min-delta",
+        type=_TimeSpanInMs,
+        default=1.0,
+        help="minimum absolute slowdown to be a regression, default 1ms",
+    )
+    cmd_history.add_argument(
+        "--fail-on-regression",
+        action="store_true",
+        help="exit with non-zero status if any regression found",
+    )
+    cmd_history.add_argument(
+        "id", nargs="*", type=ProblemId, help="show specific problems"
+    )
+
+    cmd_serve = subparsers.add_parser(
+        "serve", help="serve runs with warm worker processes, used by run"
+    )
+    cmd_serve.add_argument("--stop", action="store_true", help="stop the server")
+    cmd_serve.add_argument(
+        "-j",
+        "--jobs",
+        type=_positive_int,
+        default=None,
+        help="number of worker processes, default is "
+        + "the number of pinned or usable CPUs",
+    )
+    cmd_serve.add_argument(
+        "--pin",
+        type=_cpu_list,
+        default=None,
+        metavar="CPU[,CPU...]",
+        help="pin worker processes to CPUs, runs should pin the same",
+    )
+    cmd_serve.add_argument(
+        "--nice", type=int, default=0, metavar="N", help="niceness of workers"
+    )
+    cmd_serve.add_argument(
+        "--backend",
+        choices=sorted(BACKENDS),
+        default=KEPT_BACKEND,
+        help="how worker processes run methods, see run --backend, default is "
+        + f"{KEPT_BACKEND}",
+    )
+
+    cmd_worker = subparsers.add_parser(
+        "worker", help="run methods for runners on other hosts, see run --workers"
+    )
+    cmd_worker.add_argument(
+        "--listen",
+        type=_address,
+        required=True,
+        metavar="HOST:PORT",
+        help="address to accept runners on",
+    )
+    cmd_worker.add_argument(
+        "-j",
+        "--jobs",
+        type=_positive_int,
+        default=None,
+        help="number of worker processes, default is the number of usable CPUs",
+    )
+    cmd_worker.add_argument(
+        "--backend",
+        choices=sorted(BACKENDS),
+        default="pool",
+        help="how worker processes run methods, see run --backend",
+    )
+    cmd_worker.add_argument(
+        "--authkey",
+        default=os.environ.get(AUTHKEY_ENV),
+        help=f"key shared with runners, default is ${AUTHKEY_ENV}",
+    )
+
+    cmd_merge = subparsers.add_parser(
+        "merge", help="merge JSON results of runs, such as shards, into one report"
+    )
+    cmd_merge.add_argument(
+        "--strict", action="store_true", help="all methods should be correct"
+    )
+    cmd_merge.add_argument("files", nargs="+", metavar="FILE", help="JSON results")
+
+    return parser
+
+
+def _add_worker_arguments(cmd: argparse.ArgumentParser, timeout: float, jobs: int):
+    cmd.add_argument("--no-preload", action="store_true", help="do not preload data")
+    cmd.add_argument(
+        "-t",
+        "--timeout",
+        type=_TimeSpanInMs,
+        default=timeout,
+        help="timeout for each method of a problem, in milliseconds, "
+        + "or with unit like 500ms, 10s, 1m",
+    )
+    cmd.add_argument("--no-timeout", action="store_true", help="disable timeout")
+    cmd.add_argument(
+        "-j",
+        "--jobs",
+        type=_positive_int,
+        default=jobs,
+        help="number of worker processes, default is "
+        + ("the number of pinned or usable CPUs" if jobs is None else f"{jobs}"),
+    )
+    cmd.add_argument(
+        "--pin",
+        type=_cpu_list,
+        default=None,
+        metavar="CPU[,CPU...]",
+        help="pin worker processes to CPUs in round-robin, e.g. 2,3 or 2-5",
+    )
+    cmd.add_argument(
+        "--nice",
+        type=int,
+        default=0,
+        metavar="N",
+        help="niceness of worker processes, negative one raises their priority "
+        + "and usually requires privilege",
+    )
+    cmd.add_argument(
+        "--mem-limit",
+        type=_SizeInBytes,
+        default=0,
+        metavar="SIZE",
+        help="memory limit of each method on top of what its worker uses, e.g. "
+        + "512M, problems may set their own by MEMORY_LIMIT",
+    )
+    cmd.add_argument(
+        "--backend",
+        choices=sorted(BACKENDS),
+        default=None,
+        help="how worker processes run methods, 'fork' runs each method in a "
+        + "fresh process forked from a warm template process, default is pool, "
+        + f"or {KEPT_BACKEND} with --watch and on run server",
+    )
+    cmd.add_argument(
+        "--workers",
+        type=_address_list,
+        default=None,
+        metavar="HOST:PORT[,HOST:PORT...]",
+        help="run methods on worker agents started by the worker command, "
+        + "instead of local worker processes, -j is decided by the agents",
+    )
+    cmd.add_argument(
+        "--authkey",
+        default=os.environ.get(AUTHKEY_ENV),
+        help=f"key shared with worker agents, default is ${AUTHKEY_ENV}",
+    )
+    cmd.add_argument(
+        "--gc",
+        choices=GC_MODES,
+        default="on",
+        help="garbage collector while timing methods, 'off' disables it, "
+        + "'freeze' moves objects existing before the call out of collection",
+    )
+    cmd.add_argument(
+        "--no-history", action="store_true", help="do not record timing history"
+    )
+
+
+COLOUR_MAP = {
+    "black": 30,
+    "red": 31,
+    "green": 32,
+    "yellow": 33,
+    "blue": 34,
+    "magenta": 35,
+    "cyan": 36,
+    "white": 37,
+    "brightblack": 90,
+    "brightred": 91,
+    "brightgreen": 92,
+    "brightyellow": 93,
+    "brightblue": 94,
+    "brightmagenta": 95,
+    "brightcyan": 96,
+    "brightwhite": 97,
+}
+
+
+def _get_colour_str(s: str, colour: str, is_tty: bool) -> str:
+    if not is_tty:
+        return s
+
+    if platform.system() == "Windows" and IS_WINDOWS_LEGACY_TERMINAL:
+        # Legacy Windows command prompt does not support ANSI escape code
+        return s
+
+    if colour not in COLOUR_MAP:
+        return s
+
+    return f"\033[{COLOUR_MAP[colour]}m{s}\033[0m"
+
+
+class _ColourOutMeta(type):
+    """
+    Colour output meta class.
+    """
+
+    def __getattr__(cls, colour):
+        def _colour_print(s: str, is_tty: bool) -> None:
+            return _get_colour_str(s, colour, is_tty)
+
+        return _colour_print
+
+
+class ClrOut(metaclass=_ColourOutMeta):
+    """
+    Colour output.
+    """
+
+    @staticmethod
+    def write(s: str, colour: str, is_tty: bool) -> str:
+        """
+        Write a string with colour.
+        """
+        return _get_colour_str(s, colour, is_tty)
+
+
+def _add_indent(s: str, indent: str) -> str:
+    lines = s.split("\n")
+    result = [indent + line for line in lines]
+    return "\n".join(result)
+
+
+def _format_size(value: float) -> str:
+    """
+    Format size in bytes with a readable unit.
+    """
+    for unit in ("B", "K", "M", "G"):
+        if abs(value) < 1024.0 or unit == "G":
+            return f"{value:.0f}{unit}" if unit == "B" else f"{value:.1f}{unit}"
+
+        value /= 1024.0
+
+    return f"{value:.1f}T"
+
+
+def _format_ms(value: float) -> str:
+    """
+    Format time span in milliseconds with a readable unit.
+    """
+    if value < 1.0:
+        return f"{value * 1000.0:8.3f}us"
+
+    if value < 1000.0:
+        return f"{value:8.3f}ms"
+
+    return f"{value / 1000.0:8.3f}s "
+
+
+class _NotRunResult:
+    def __repr__(self) -> str:
+        return "NOT RUN"
+
+
+class _TimeoutResult:
+    def __repr__(self) -> str:
+        return "TIMEOUT"
+
+
+class _OutOfMemoryResult:
+    def __repr__(self) -> str:
+        return "OOM"
+
+
+class _ErrorResult:
+    def __repr__(self) -> str:
+        return "ERROR"
+
+
+class SolutionMethod:
+    """
+    Solution method
+    """
+
+    def __init__(self, module_name: str, func_name: str, name: str, note: str = ""):
+        self.module_name = module_name
+        self.func_name = func_name
+        self.name = name
+        self.note = note or ""
+        self.time_cost = 0.0
+        self.result = _NotRunResult()
+        self.finished = False
+        self.bench = None
+        self.cached = False
+        self.info = {}
+        self.noise = []
+        self.oom = None
+        self.error = None
+        self.deadline = None
+        self.skipped = None
+        self.cancelled = None
+        self.previous = None
+
+    def skip(self, reason: str) -> None:
+        """
+        Mark the solution method skipped, it is not run.
+        """
+        self.skipped = reason
+
+    def cancel(self, cost: float, winner: SolutionMethod) -> None:
+        """
+        Mark the solution method cancelled after running for `cost`, since
+        another method won the race.
+        """
+        self.cancelled = (cost, winner.func_name)
+
+    def set_cached(self, result: int, cost: float) -> None:
+        """
+        Set result of the solution method from cache.
+        """
+        self.set_result(result, False, cost)
+        self.cached = True
+
+    def set_result(
+        self, result: int, is_timeout: bool, cost: float, info: dict | None = None
+    ) -> None:
+        """
+        Set result of the solution method, with extra information reported by
+        worker, such as profile.
+        """
+        self.finished = not is_timeout
+        self.time_cost = cost
+        self.info = info or {}
+        if isinstance(result, BenchResult):
+            self.bench = BenchStats(result.samples, result.loops)
+            self.time_cost = self.bench.median
+            result = result.result
+
+        self.oom = self.info.get("oom")
+        self.error = self.info.get("error")
+        if isinstance(result, (_OutOfMemoryResult, _ErrorResult)):
+            result = None
+
+        self.noise = HostMonitor.assess(self.info.get("host", {}))
+        if self.bench is not None and self.bench.cov > NOISE_COV:
+            self.noise.append(f"cv {self.bench.cov:.0%}")
+
+        if not is_timeout:
+            self.result = result
+
+        else:
+            self.result = None
+
+    @property
+    def title(self) -> str:
+        """
+        Title of this method.
+        """
+        result = self.name
+        if self.note != "":
+            result = self.note.strip().split("\n")[0]
+
+        return result
+
+    def is_timeout(self) -> bool:
+        """
+        Is solution method timeout
+        """
+        return not self.finished
+
+    def is_run(self) -> bool:
+        """
+        Is solution method run.
+        """
+        return not isinstance(self.result, _NotRunResult)
+
+    def status(self, answer: int = None) -> str:
+        """
+        Status of solution method, "correct" or "wrong" if answer is given,
+        otherwise "done", or one of "not run", "timeout", "oom", "error" and
+        "no result".
+        """
+        if not self.is_run():
+            return "not run"
+
+        if self.is_timeout():
+            return "timeout"
+
+        if self.oom is not None:
+            return "oom"
+
+        if self.error is not None:
+            return "error"
+
+        if self.result is None:
+            return "no result"
+
+        if answer is None:
+            return "done"
+
+        return "correct" if self.result == answer else "wrong"
+
+    def print(
+        self,
+        title: str,
+        suffix: str | None,
+        answer: int = None,
+        is_tty: bool = False,
+        rusage: bool = False,
+    ) -> str:
+        """
+        Print result of this method, with resource usage columns if required.
+        """
+        line = [f"{title}"]
+
+        if self.skipped is not None or self.cancelled is not None:
+            if self.skipped is not None:
+                note = f" SKIPPED for {self.skipped}"
+            else:
+                cost, winner = self.cancelled
+                when = "before start"
+                if cost > 0.0:
+                    when = f"after {_format_ms(cost).strip()}"
+                note = f" CANCELLED {when}, lost to {winner}"
+
+            line.append(ClrOut.brightblack(note, is_tty))
+            if suffix is not None:
+                line.append(f" {suffix}")
+
+            return "".join(line)
+
+        if self.result is None:
+            r = "NO RESULT"
+            c = "red"
+        else:
+            r = f"{self.result}"
+            c = None
+
+        line.append(ClrOut.write(f" {r:<15}", c, is_tty))
+
+        if answer is not None:
+            if self.is_timeout():
+                rc = "timeout"
+                cl = "yellow"
+
+            elif self.oom is not None:
+                rc = "OOM"
+                cl = "red"
+
+            elif self.error is not None:
+                rc = "ERROR"
+                cl = "red"
+
+            elif self.result is None:
+                rc = "NO ANSWER"
+                cl = "yellow"
+
+            elif answer == self.result:
+                rc = "correct"
+                cl = "green"
+
+            else:
+                rc = "wrong"
+                cl = "red"
+
+            line.append(ClrOut.write(f" {rc:10}", cl, is_tty))
+
+        if self.time_cost < 200.0:
+            cost_colour = "green"
+        elif self.time_cost < 500.0:
+            cost_colour = "cyan"
+        elif self.time_cost < 2000.0:
+            cost_colour = "yellow"
+        else:
+            cost_colour = "red"
+
+        if not self.result:
+            cost_colour = None
+
+        line.append(ClrOut.write(f" {self.time_cost:10.3f}ms", cost_colour, is_tty))
+        if rusage:
+            line.append(self.print_rusage())
+
+        postmortem = self.info.get("postmortem")
+        if postmortem is not None and len(postmortem["stack"]) > 0:
+            filename, lineno, name = postmortem["stack"][-1]
+            where = f" at {name} ({os.path.basename(filename)}:{lineno})"
+            line.append(ClrOut.yellow(where, is_tty))
+
+        if self.oom is not None:
+            how = "killed" if self.oom.get("killed") else "out of memory"
+            peak = self.oom.get("peak")
+            if peak is not None:
+                how += f" at peak {_format_size(peak)}"
+            line.append(ClrOut.red(f" {how}", is_tty))
+
+        if self.error is not None:
+            line.append(ClrOut.red(f" {self.error.strip().splitlines()[-1]}", is_tty))
+
+        if "lost" in self.info:
+            line.append(ClrOut.red(f" {self.info['lost']}", is_tty))
+
+        if self.noise and not self.is_timeout():
+            line.append(ClrOut.yellow(f" noisy({', '.join(self.noise)})", is_tty))
+
+        if self.cached:
+            line.append(ClrOut.brightblack(" (cached)", is_tty))
+
+        if suffix is not None:
+            line.append(f" {suffix}")
+
+        return "".join(line)
+
+    def annotation(self, marker: str | None = None) -> str | None:
+        """
+        Suffix of the printed line, the adaptive deadline and previous time
+        cost of the method if any, followed by `marker`.
+        """
+        notes = []
+        if self.deadline is not None:
+            notes.append(f"[deadline {self.deadline:.2f}ms]")
+        if self.previous is not None:
+            notes.append(f"[was {self.previous:.3f}ms]")
+        if marker is not None:
+            notes.append(marker)
+
+        return " ".join(notes) or None
+
+    def print_rusage(self) -> str:
+        """
+        Print resource usage columns of this method.
+        """
+        usage = self.info.get("rusage")
+        if usage is None:
+            line = f" {'':58}"
+
+        else:
+            rss = _format_size(usage["maxrss_delta"] * 1024)
+            faults = f"{usage['majflt']}/{usage['minflt']}"
+            switches = f"{usage['nvcsw']}/{usage['nivcsw']}"
+            line = (
+                f" usr{usage['cpu_user']:9.1f}ms sys{usage['cpu_sys']:8.1f}ms"
+                + f" rss+{rss:>7} flt {faults:>9} cs {switches:>7}"
+            )
+
+        collector = self.info.get("gc")
+        if collector is not None:
+            collections = "/".join(f"{n}" for n in collector["collections"])
+            line += f" gc {collections:>11} {collector['time']:7.1f}ms"
+
+        return line
+
+    def print_details(self, indent: str, is_tty: bool = False) -> list[str]:
+        """
+        Print extra information of this method, each line is indented.
+        """
+        lines = []
+        profile = self.info.get("profile")
+        if profile is not None:
+            header = f"{'ncalls':>12} {'tottime':>12} {'cumtime':>12}  function"
+            lines.append(ClrOut.brightblack(header, is_tty))
+            for label, ncalls, tottime, cumtime in profile:
+                lines.append(
+                    f"{ncalls:>12} {tottime:10.3f}ms {cumtime:10.3f}ms  {label}"
+                )
+
+        if self.error is not None:
+            pattern = r'^  File "(.+)", line (\d+), in (.+)$'
+            frames = re.findall(pattern, self.error, re.M)
+            # frames of the method follow the last frame of runner
+            runner = [i for i, frame in enumerate(frames) if frame[0] == __file__]
+            frames = frames[runner[-1] + 1 :] if runner else frames
+            for filename, lineno, name in frames[-3:][::-1]:
+                where = f"{name} ({os.path.basename(filename)}:{lineno})"
+                lines.append(f"{'at':>12} {where}")
+
+        postmortem = self.info.get("postmortem")
+        if postmortem is not None:
+            title = f"post-mortem saved to {self.info['postmortem_path']}"
+            lines.append(ClrOut.brightblack(title, is_tty))
+            for filename, lineno, name in postmortem["stack"][-3:][::-1]:
+                where = f"{name} ({os.path.basename(filename)}:{lineno})"
+                lines.append(f"{'at':>12} {where}")
+
+            for label, ratio in postmortem["lines"][:3]:
+                lines.append(f"{ratio:>12.1%} {label}")
+
+        alloc = self.info.get("alloc")
+        if alloc is not None:
+            header = (
+                f"peak {_format_size(alloc['peak'])}"
+                + f", allocated at least {_format_size(alloc['allocated'])}"
+                + f", snapshot of {_format_size(alloc['snapshot'])}"
+                + f" saved to {self.info['alloc_path']}"
+            )
+            lines.append(ClrOut.brightblack(header, is_tty))
+            for title, key in (("by size", "by_size"), ("by count", "by_count")):
+                for label, size, count in alloc[key]:
+                    size = _format_size(size)
+                    lines.append(f"{title:>12} {size:>8} {count:>9} blocks  {label}")
+
+        sample = self.info.get("sample")
+        if sample is not None:
+            header = f"{'self':>12} {'total':>12} {sample['count']:>8} samples"
+            lines.append(ClrOut.brightblack(header, is_tty))
+            for label, self_ratio, total_ratio in sample["top"]:
+                lines.append(f"{self_ratio:>12.1%} {total_ratio:>12.1%}  {label}")
+
+        return [indent + line for line in lines]
+
+    def print_bench(
+        self, title: str, fastest: float | None, is_tty: bool = False
+    ) -> str:
+        """
+        Print benchmark result of this method.
+        """
+        if self.bench is None:
+            r = "NO RESULT" if self.is_timeout() else "NOT RUN"
+            return f"{title}" + ClrOut.write(f" {r}", "red", is_tty)
+
+        stats = self.bench
+        line = [
+            f"{title}",
+            f" min {_format_ms(stats.min)}",
+            f" median {_format_ms(stats.median)}",
+            f" iqr {_format_ms(stats.iqr)}",
+            f" stddev {_format_ms(stats.stdev)}",
+            f" cv {stats.cov:6.1%}",
+            f" {stats.loops:>7d} x {len(stats.samples):<3d}",
+        ]
+        if fastest is not None and fastest > 0.0:
+            ratio = stats.median / fastest
+            colour = "green" if ratio < 1.0 + 1e-9 else None
+            line.append(ClrOut.write(f" x{ratio:.2f}", colour, is_tty))
+
+        if self.noise:
+            line.append(ClrOut.yellow(f" noisy({', '.join(self.noise)})", is_tty))
+
+        return "".join(line).rstrip()
+
+
+class ProblemSolver:
+    """
+    Base class of problem solution.
+    """
+
+    methods: Mapping[str, SolutionMethod]
+    pid: int
+    answer: int | None = None
+    module_name: str = ""
+    timeout_ext: float = 0.0
+    memory_limit: int = 0
+    has_extra_data: str = ""
+    __doc__ = ""
+
+    def __init__(self, pid: int, module_name: str):
+        self.module_name = module_name
+        self.pid = pid
+        self.answer = None
+        self._method_names = []
+        self.methods = {}
+        self.title = ""
+        self.content = ""
+        self.timeout_ext = 0.0
+        self.memory_limit = 0
+        self.winner = None
+
+    def set_document(self, doc: str):
+        """
+        Set document of this problem.
+        """
+        self.__doc__ = doc
+        lines = doc.strip().split("\n")
+        if len(lines) < 2:
+            raise RuntimeError("Invalid document format")
+
+        self.title = lines[0].strip()
+        self.content = "\n".join(lines[1:]).strip()
+
+    def add_method(self, func_name: str, name: str, note: str = ""):
+        """
+        Add a solution method.
+        """
+        if name in self.methods:
+            raise RuntimeError(f"Method {name} already exists")
+
+        method = SolutionMethod(self.module_name, func_name, name, note)
+        self._method_names.append(name)
+        self.methods[name] = method
+
+    def set_description(self, info: Mapping[str, object]):
+        """
+        Set description of this problem, made by describe_problem().
+        """
+        self.set_document(info["doc"])
+        self.answer = info["answer"]
+        self.timeout_ext = info["timeout_ext"]
+        try:
+            self.memory_limit = _SizeInBytes(info["memory_limit"] or 0)
+
+        except (TypeError, ValueError) as ex:
+            raise RuntimeError(f"Invalid MEMORY_LIMIT: {info['memory_limit']}") from ex
+
+        for func_name, note in info["methods"]:
+            name = "" if func_name == "solve" else func_name[6:]
+            self.add_method(func_name, name, note)
+
+        if info["extra_data"]:
+            self.has_extra_data = info["extra_data"]
+
+    def retain_methods(self, names: Iterable[str]) -> None:
+        """
+        Keep only methods of the given names.
+        """
+        names = set(names)
+        self._method_names = [name for name in self._method_names if name in names]
+        self.methods = {name: self.methods[name] for name in self._method_names}
+
+    def order_methods(self, names: list[str]) -> None:
+        """
+        Order methods as the given names, methods not given keep their order
+        after them.
+        """
+        order = {name: i for i, name in enumerate(names)}
+        self._method_names.sort(key=lambda name: order.get(name, len(order)))
+
+    def each_methods(self) -> Iterator[tuple[str, SolutionMethod]]:
+        """
+        Iterate all methods.
+        """
+        for name in self._method_names:
+            yield name, self.methods[name]
+
+    def _is_correct(self) -> bool:
+        """
+        Is the solution correct, should have at less one correct result.
+        """
+        result = False
+        for method in self.methods.values():
+            if method.is_timeout():
+                continue
+
+            if method.result is None:
+                continue
+
+            if self.answer is not None and method.result != self.answer:
+                result = result or False
+                continue
+
+            result = result or True
+
+        return result
+
+    def _is_all_correct(self) -> bool:
+        """
+        Is all methods correct.
+        """
+        for method in self.methods.values():
+            if method.is_timeout():
+                continue
+
+            if method.result is None:
+                continue
+
+            if self.answer is not None and method.result != self.answer:
+                return False
+
+        return True
+
+    def is_skipped(self) -> bool:
+        """
+        Are all methods of the problem skipped.
+        """
+        return all(m.skipped is not None for m in self.methods.values())
+
+    def is_correct(self, strict: bool = False) -> bool:
+        """
+        Is the solution correct.
+        """
+        if strict:
+            return self._is_all_correct()
+
+        return self._is_correct()
+
+    def find_best_solution(self, check: bool = False) -> str:
+        """
+        Find the best solution, none if any method is skipped, which may be
+        faster than all methods run.
+        """
+        if any(method.skipped is not None for method in self.methods.values()):
+            return None
+
+        cost = None
+        best = None
+        for name, method in self.each_methods():
+            if method.is_timeout():
+                continue
+
+            if method.result is None:
+                continue
+
+            if check and self.answer is not None and method.result != self.answer:
+                continue
+
+            if cost is None or method.time_cost < cost:
+                cost = method.time_cost
+                best = name
+
+        return best
+
+    def print(
+        self,
+        check: bool = False,
+        strict: bool = False,
+        is_tty: bool = False,
+        rusage: bool = False,
+    ) -> str:
+        """
+        Print result of a problem solver.
+        """
+        lines = []
+
+        answer = self.answer
+        if not check:
+            answer = None
+        header = f"{self.pid:<5} {self.title:.<40}"
+        if len(self.methods) > 1:
+            best = self.find_best_solution(check=check)
+            total_cost = 0.0
+            for name, method in self.each_methods():
+                suffix = method.annotation("*BEST" if name == best else None)
+                title = f"      + {method.title:.<38}"
+                line = method.print(
+                    title, suffix, answer=answer, is_tty=is_tty, rusage=rusage
+                )
+                lines.append(line)
+                lines += method.print_details(" " * 8, is_tty=is_tty)
+                total_cost += method.time_cost
+
+            placeholder = ""
+            note = ""
+            if self.timeout_ext > 0.0:
+                note = f"[+{self.timeout_ext:.2f}ms]"
+
+            if check:
+                if self.is_skipped():
+                    correct = ClrOut.brightblack("skipped   ", is_tty)
+                elif self.is_correct(strict=strict):
+                    correct = ClrOut.green("correct   ", is_tty)
+                else:
+                    correct = ClrOut.red("wrong     ", is_tty)
+
+                header += f" {placeholder:15} {correct} {total_cost:10.3f}ms {note}"
+                lines.insert(0, header)
+            else:
+                header += f" {placeholder:15} {total_cost:10.3f}ms {note}"
+                lines.insert(0, header)
+
+        elif len(self.methods) == 1:
+            method = list(self.methods.values())[0]
+            suffix = method.annotation()
+            if self.timeout_ext > 0.0:
+                extension = f"[+{self.timeout_ext:.2f}ms]"
+                suffix = extension if suffix is None else f"{extension} {suffix}"
+            line = method.print(
+                header, suffix, answer=answer, is_tty=is_tty, rusage=rusage
+            )
+            lines.append(line)
+            lines += method.print_details(" " * 6, is_tty=is_tty)
+
+        else:
+            header += " NO SOLUTION"
+            lines.append(header)
+
+        return "\n".join(lines)
+
+    def print_bench(self, is_tty: bool = False) -> str:
+        """
+        Print benchmark result of a problem solver, with speed of each method
+        relative to the fastest one.
+        """
+        medians = [m.bench.median for m in self.methods.values() if m.bench]
+        fastest = min(medians) if len(medians) > 1 else None
+
+        header = f"{self.pid:<5} {self.title:.<40}"
+        if len(self.methods) > 1:
+            lines = [header]
+            for _, method in self.each_methods():
+                title = f"      + {method.title:.<38}"
+                lines.append(method.print_bench(title, fastest, is_tty=is_tty))
+
+        elif len(self.methods) == 1:
+            method = list(self.methods.values())[0]
+            lines = [method.print_bench(header, None, is_tty=is_tty)]
+
+        else:
+            lines = [header + " NO SOLUTION"]
+
+        return "\n".join(lines)
+
+    def method_timeout(
+        self, conf: RunConfigure, method: SolutionMethod | None = None
+    ) -> float:
+        """
+        Timeout of a method of this problem, 0.0 for no timeout. The adaptive
+        deadline of the method is taken if any, and scaled while allocations
+        are traced.
+        """
+        if conf.timeout <= 0.0:
+            return 0.0
+
+        if method is not None and method.deadline is not None:
+            timeout = method.deadline
+        else:
+            timeout = conf.timeout + self.timeout_ext
+
+        if conf.trace_alloc:
+            timeout *= TRACE_ALLOC_TIMEOUT_SCALE
+
+        return timeout
+
+    def method_memory_limit(self, conf: RunConfigure) -> int:
+        """
+        Memory limit of each method of this problem in bytes, 0 for no limit.
+        """
+        return self.memory_limit or conf.mem_limit
+
+
+def _frame_label(code) -> str:
+    filename = os.path.basename(code.co_filename)
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """
+    Sampling profiler, captures Python stack of main thread on timer signal.
+    Stacks are rooted at the solution method, frames of runner are dropped.
+    """
+
+    def __init__(self, interval: float = 5.0, timer: str = "prof"):
+        self.interval = interval / 1000.0
+        if timer == "prof":
+            self.timer, self.signum = signal.ITIMER_PROF, signal.SIGPROF
+        else:
+            self.timer, self.signum = signal.ITIMER_REAL, signal.SIGALRM
+        self.stacks = collections.Counter()
+        self.lines = collections.Counter()
+        self.count = 0
+        self.duration = 0.0
+        self.on_finish = None
+        self._previous = None
+        self._time_start = 0.0
+
+    @staticmethod
+    def is_supported() -> bool:
+        """
+        Is sampling supported on this platform.
+        """
+        return hasattr(signal, "setitimer")
+
+    def _on_signal(self, _signum, frame) -> None:
+        stack = []
+        innermost = None
+        while frame is not None:
+            code = frame.f_code
+            if code.co_filename == __file__:
+                if len(stack) > 0:
+                    break  # reach runner
+
+            else:
+                if innermost is None:
+                    # line number is unknown in some states of a frame
+                    innermost = (code, frame.f_lineno or code.co_firstlineno)
+                stack.append(code)
+
+            frame = frame.f_back
+
+        if innermost is None:
+            return
+
+        self.count += 1
+        self.stacks[tuple(reversed(stack))] += 1
+        self.lines[innermost] += 1
+
+        if self.duration > 0.0:
+            elapsed = 1000.0 * (time.perf_counter() - self._time_start)
+            if elapsed >= self.duration:
+                self.stop()
+                if self.on_finish is not None:
+                    self.on_finish(self)
+
+    def start(self, duration: float = 0.0, on_finish: Callable = None) -> None:
+        """
+        Start sampling, stop automatically after duration in milliseconds
+        if given, and call on_finish with this sampler.
+        """
+        self.duration = duration
+        self.on_finish = on_finish
+        self._time_start = time.perf_counter()
+        self._previous = signal.signal(self.signum, self._on_signal)
+        signal.setitimer(self.timer, self.interval, self.interval)
+
+    def stop(self) -> None:
+        """
+        Stop sampling.
+        """
+        signal.setitimer(self.timer, 0.0, 0.0)
+        signal.signal(self.signum, self._previous or signal.SIG_DFL)
+
+    def folded(self) -> dict[tuple[str, ...], int]:
+        """
+        Collapsed stacks, each is a tuple of frame labels from root.
+        """
+        result = collections.Counter()
+        for stack, count in self.stacks.items():
+            result[tuple(_frame_label(code) for code in stack)] += count
+
+        return dict(result)
+
+    def top_functions(self, n: int) -> list[tuple[str, float, float]]:
+        """
+        Functions with top self samples, as (label, self ratio, total ratio).
+        """
+        self_counts = collections.Counter()
+        total_counts = collections.Counter()
+        for stack, count in self.stacks.items():
+            self_counts[stack[-1]] += count
+            for code in set(stack):
+                total_counts[code] += count
+
+        total = max(1, self.count)
+        return [
+            (_frame_label(code), count / total, total_counts[code] / total)
+            for code, count in self_counts.most_common(n)
+        ]
+
+    def hot_lines(self, n: int) -> list[tuple[str, float]]:
+        """
+        Lines with top samples, as (label, ratio).
+        """
+        total = max(1, self.count)
+        return [
+            (
+                f"{os.path.basename(code.co_filename)}:{lineno} ({code.co_name})",
+                count / total,
+            )
+            for (code, lineno), count in self.lines.most_common(n)
+        ]
+
+
+def write_folded(path: str, stacks: Mapping[tuple[str, ...], int]) -> None:
+    """
+    Write collapsed stacks in the format of Brendan Gregg's FlameGraph.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        for stack, count in sorted(stacks.items()):
+            names = (name.replace(";", ":") for name in stack)
+            f.write(f"{';'.join(names)} {count}\n")
+
+
+def write_flamegraph(
+    path: str, stacks: Mapping[tuple[str, ...], int], title: str
+) -> None:
+    """
+    Write a self-contained SVG flamegraph of collapsed stacks.
+    """
+    root = {"count": 0, "children": {}}
+    for stack, count in stacks.items():
+        node = root
+        node["count"] += count
+        for name in stack:
+            node = node["children"].setdefault(name, {"count": 0, "children": {}})
+            node["count"] += count
+
+    depth = max((len(stack) for stack in stacks), default=0) + 1
+    width, row, padding = 1200.0, 16, 10.0
+    height = depth * row + 2 * padding + 24
+    total = max(1, root["count"])
+    scale = (width - 2 * padding) / total
+    items = []
+
+    def _walk(name: str, node: dict, x: float, level: int):
+        w = node["count"] * scale
+        if w < 0.1:
+            return
+
+        y = height - padding - (level + 1) * row
+        hue = zlib.crc32(name.encode()) % 60
+        colour = f"hsl({hue}, 85%, {55 + hue % 20}%)"
+        ratio = node["count"] / total
+        tip = html.escape(f"{name} ({node['count']} samples, {ratio:.2%})")
+        chars = int(w / 7)
+        text = name if len(name) <= chars else name[: max(0, chars - 2)] + ".."
+        label = ""
+        if chars >= 3:
+            label = f'<text x="{x + 3:.1f}" y="{y + row - 4:.1f}">'
+            label += f"{html.escape(text)}</text>"
+        items.append(
+            f'<g><title>{tip}</title><rect x="{x:.1f}" y="{y:.1f}" width="{w:.1f}" '
+            + f'height="{row - 1}" fill="{colour}" rx="2"/>'
+            + label
+            + "</g>"
+        )
+        for child_name, child in sorted(node["children"].items()):
+            _walk(child_name, child, x, level + 1)
+            x += child["count"] * scale
+
+    _walk("all", root, padding, 0)
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{width:.0f}" '
+            + f'height="{height:.0f}" font-family="monospace" font-size="12">\n'
+            + '<rect width="100%" height="100%" fill="#f8f8f8"/>\n'
+            + f'<text x="{width / 2:.0f}" y="20" text-anchor="middle" '
+            + f'font-size="16">{html.escape(title)}</text>\n'
+        )
+        f.write("\n".join(items))
+        f.write("\n</svg>\n")
+
+
+class _Sampler:
+    """
+    Instrument of job, profile the method with sampling profiler, save
+    collapsed stacks and optional flamegraph, report top functions.
+    """
+
+    def __init__(self, path: str, interval: float, flamegraph: bool, top: int):
+        self.path = path
+        self.flamegraph = flamegraph
+        self.top = top
+        self.sampler = StackSampler(interval)
+
+    def start(self) -> None:
+        """
+        Start sampling.
+        """
+        self.sampler.start()
+
+    def stop(self, info: dict) -> None:
+        """
+        Stop sampling and report.
+        """
+        self.sampler.stop()
+        stacks = self.sampler.folded()
+        write_folded(f"{self.path}.folded", stacks)
+        info["sample_path"] = f"{self.path}.folded"
+        if self.flamegraph:
+            title = os.path.basename(self.path)
+            write_flamegraph(f"{self.path}.svg", stacks, title)
+
+        info["sample"] = {
+            "count": self.sampler.count,
+            "top": self.sampler.top_functions(self.top),
+        }
+
+
+class _PostMortem:
+    """
+    Worker side of timeout post-mortem. When runner sends SIGUSR2 to a worker
+    running a timeout method, the current stack is captured, then the method
+    is sampled for a short time, and all is dumped to a JSON file, before the
+    worker is killed by runner.
+    """
+
+    path = None
+    sampler = None
+
+    @staticmethod
+    def is_supported() -> bool:
+        """
+        Is post-mortem supported on this platform.
+        """
+        return hasattr(signal, "SIGUSR2") and StackSampler.is_supported()
+
+    @classmethod
+    def arm(cls, path: str) -> None:
+        """
+        Prepare post-mortem of a running method, dumped to path.
+        """
+        cls.path = path
+        cls.sampler = None
+        signal.signal(signal.SIGUSR2, cls._on_request)
+
+    @classmethod
+    def disarm(cls) -> None:
+        """
+        The method is finished, ignore post-mortem request.
+        """
+        cls.path = None
+        if cls.sampler is not None:
+            cls.sampler.stop()
+            cls.sampler = None
+
+    @classmethod
+    def _on_request(cls, _signum, frame) -> None:
+        if cls.path is None or cls.sampler is not None:
+            return
+
+        stack = []
+        while frame is not None and frame.f_code.co_filename != __file__:
+            code = frame.f_code
+            lineno = frame.f_lineno or code.co_firstlineno
+            stack.append((code.co_filename, lineno, code.co_name))
+            frame = frame.f_back
+
+        sampler = StackSampler(POSTMORTEM_INTERVAL, timer="real")
+        sampler.stack = stack[::-1]
+        cls.sampler = sampler
+        sampler.start(duration=POSTMORTEM_TIME, on_finish=cls._dump)
+
+    @classmethod
+    def _dump(cls, sampler: StackSampler) -> None:
+        path = cls.path
+        if path is None:
+            return
+
+        content = {
+            "stack": sampler.stack,
+            "count": sampler.count,
+            "duration": POSTMORTEM_TIME,
+            "lines": sampler.hot_lines(10),
+            "functions": sampler.top_functions(10),
+            "folded": [[";".join(k), v] for k, v in sampler.folded().items()],
+        }
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+            json.dump(content, f)
+
+        os.replace(f"{path}.tmp", path)
+
+
+def _postmortem_text(name: str, dt: float, content: dict) -> str:
+    lines = [
+        f"Post-mortem of {name}",
+        f"Timeout after {dt:.3f}ms, sampled {content['duration']:.0f}ms "
+        + f"({content['count']} samples)",
+        "",
+        "Stack (most recent call last):",
+    ]
+    for filename, lineno, func_name in content["stack"]:
+        lines.append(f'  File "{filename}", line {lineno}, in {func_name}')
+        source = linecache.getline(filename, lineno).strip()
+        if source:
+            lines.append(f"    {source}")
+
+    lines += ["", "Hot lines:"]
+    lines += [f"  {ratio:7.1%}  {label}" for label, ratio in content["lines"]]
+    lines += ["", "Hot functions (self, total):"]
+    lines += [
+        f"  {self_ratio:7.1%} {total_ratio:7.1%}  {label}"
+        for label, self_ratio, total_ratio in content["functions"]
+    ]
+    lines += ["", "Collapsed stacks:"]
+    lines += [f"  {stack} {count}" for stack, count in content["folded"]]
+    return "\n".join(lines) + "\n"
+
+
+def _is_runner_frame(func: tuple[str, int, str], callers: Mapping) -> bool:
+    """
+    Is a profiled function part of runner itself, not the solution method.
+    """
+    if func[0] == __file__:
+        return True
+
+    if len(callers) == 0:
+        return func[0] == "~"  # built-in function called before profiling
+
+    return all(caller[0] == __file__ for caller in callers)
+
+
+def _peak_rss() -> int | None:
+    """
+    Peak RSS of this process in bytes, None if unknown.
+    """
+    if resource is None:
+        return None
+
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_maxrss * 1024 // _ResourceUsage.MAXRSS_UNIT
+
+
+class _ResourceUsage:
+    """
+    Instrument of job, measure CPU time, peak RSS, page faults and context
+    switches of the method by getrusage().
+    """
+
+    # ru_maxrss is in bytes on macOS, in kilobytes elsewhere
+    MAXRSS_UNIT = 1024 if sys.platform == "darwin" else 1
+
+    def __init__(self):
+        self.before = None
+
+    @staticmethod
+    def is_supported() -> bool:
+        """
+        Is getrusage() supported on this platform.
+        """
+        return resource is not None
+
+    def start(self) -> None:
+        """
+        Take resource usage before the call.
+        """
+        self.before = resource.getrusage(resource.RUSAGE_SELF)
+
+    def stop(self, info: dict) -> None:
+        """
+        Report resource usage of the call.
+        """
+        after = resource.getrusage(resource.RUSAGE_SELF)
+        before = self.before
+        info["rusage"] = {
+            "cpu_user": 1000.0 * (after.ru_utime - before.ru_utime),
+            "cpu_sys": 1000.0 * (after.ru_stime - before.ru_stime),
+            "maxrss": after.ru_maxrss // self.MAXRSS_UNIT,
+            "maxrss_delta": (after.ru_maxrss - before.ru_maxrss) // self.MAXRSS_UNIT,
+            "majflt": after.ru_majflt - before.ru_majflt,
+            "minflt": after.ru_minflt - before.ru_minflt,
+            "nvcsw": after.ru_nvcsw - before.ru_nvcsw,
+            "nivcsw": after.ru_nivcsw - before.ru_nivcsw,
+        }
+
+
+class _MemoryLimit:
+    """
+    Instrument of job, limit memory of the method by setrlimit() on top of
+    what the worker process uses already. RLIMIT_AS is used where the size
+    of address space is known from /proc, otherwise RLIMIT_DATA on top of
+    peak RSS, which is only a rough baseline.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.kind = None
+        self.previous = None
+
+    @staticmethod
+    def is_supported() -> bool:
+        """
+        Is setrlimit() supported on this platform.
+        """
+        return resource is not None
+
+    def _baseline(self) -> int:
+        if self.kind == resource.RLIMIT_DATA:
+            return _peak_rss()
+
+        with open("/proc/self/statm", encoding="ascii") as f:
+            return int(f.read().split()[0]) * resource.getpagesize()
+
+    def start(self) -> None:
+        """
+        Set the limit.
+        """
+        has_statm = os.path.exists("/proc/self/statm")
+        if has_statm and hasattr(resource, "RLIMIT_AS"):
+            self.kind = resource.RLIMIT_AS
+        else:
+            self.kind = resource.RLIMIT_DATA
+
+        self.previous = resource.getrlimit(self.kind)
+        soft = self._baseline() + self.limit
+        _, hard = self.previous
+        if hard != resource.RLIM_INFINITY:
+            soft = min(soft, hard)
+
+        resource.setrlimit(self.kind, (soft, hard))
+
+    def stop(self, info: dict) -> None:
+        """
+        Restore the limit.
+        """
+        resource.setrlimit(self.kind, self.previous)
+        info["memory_limit"] = self.limit
+
+
+class _GarbageCollector:
+    """
+    Instrument of job, count collections of each generation and time spent in
+    the garbage collector by gc.callbacks, and set the collector mode.
+    """
+
+    def __init__(self, mode: str = "on"):
+        self.mode = mode
+        self.collections = [0] * len(gc.get_count())
+        self.time = 0.0
+        self.collected = 0
+        self.was_enabled = True
+        self._start = None
+
+    def _callback(self, phase: str, detail: dict) -> None:
+        if phase == "start":
+            self._start = time.perf_counter()
+
+        elif self._start is not None:
+            self.time += time.perf_counter() - self._start
+            self.collections[detail["generation"]] += 1
+            self.collected += detail["collected"]
+            self._start = None
+
+    def start(self) -> None:
+        """
+        Set the collector mode and start counting.
+        """
+        self.was_enabled = gc.isenabled()
+        if self.mode == "off":
+            gc.disable()
+
+        elif self.mode == "freeze":
+            gc.collect()
+            gc.freeze()
+
+        gc.callbacks.append(self._callback)
+
+    def stop(self, info: dict) -> None:
+        """
+        Stop counting, restore the collector and report.
+        """
+        gc.callbacks.remove(self._callback)
+        if self.mode == "freeze":
+            gc.unfreeze()
+
+        if self.was_enabled:
+            gc.enable()
+
+        info["gc"] = {
+            "mode": self.mode,
+            "collections": self.collections,
+            "time": 1000.0 * self.time,
+            "collected": self.collected,
+        }
+
+
+class _AllocTracer:
+    """
+    Instrument of job, trace memory allocations of the method by tracemalloc.
+    Traced memory is polled on a virtual timer, a snapshot is taken each time
+    it doubles, so the snapshot reported and saved is close to the peak.
+    Allocated memory is summed from the rise to peak of each poll interval,
+    memory allocated and freed again below the peak is not seen.
+    """
+
+    INTERVAL = 0.01
+
+    def __init__(self, path: str, top: int):
+        self.path = path
+        self.top = top
+        self.snapshot = None
+        self.snapshot_size = 0
+        self.allocated = 0
+        self.peak = 0
+        self.last_size = 0
+        self._busy = False
+        self._previous = None
+
+    @staticmethod
+    def _has_timer() -> bool:
+        return hasattr(signal, "setitimer")
+
+    def _poll(self, *_args) -> None:
+        if self._busy:
+            return
+
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        self.allocated += max(0, peak - self.last_size)
+        self.peak = max(self.peak, peak)
+        self.last_size = current
+        if current >= 2 * self.snapshot_size and current > 0:
+            # taking snapshot of large heap spans many timer ticks
+            self._busy = True
+            try:
+                self.snapshot = tracemalloc.take_snapshot()
+                self.snapshot_size = current
+            finally:
+                self._busy = False
+
+    def start(self) -> None:
+        """
+        Start tracing.
+        """
+        tracemalloc.start()
+        if self._has_timer():
+            self._previous = signal.signal(signal.SIGVTALRM, self._poll)
+            signal.setitimer(signal.ITIMER_VIRTUAL, self.INTERVAL, self.INTERVAL)
+
+    def stop(self, info: dict) -> None:
+        """
+        Stop tracing and report.
+        """
+        if self._has_timer():
+            signal.setitimer(signal.ITIMER_VIRTUAL, 0.0, 0.0)
+            signal.signal(signal.SIGVTALRM, self._previous or signal.SIG_DFL)
+
+        self._poll()
+        if self.snapshot is None:
+            self.snapshot = tracemalloc.take_snapshot()
+
+        tracemalloc.stop()
+
+        snapshot = self.snapshot.filter_traces(
+            [
+                tracemalloc.Filter(False, __file__),
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen *>"),
+            ]
+        )
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        snapshot.dump(self.path)
+
+        stats = snapshot.statistics("lineno")
+
+        def _site(stat: tracemalloc.Statistic) -> tuple[str, int, int]:
+            frame = stat.traceback[0]
+            label = f"{os.path.basename(frame.filename)}:{frame.lineno}"
+            return label, stat.size, stat.count
+
+        by_count = sorted(stats, key=lambda stat: stat.count, reverse=True)
+        info["alloc"] = {
+            "peak": self.peak,
+            "allocated": max(self.allocated, self.peak),
+            "snapshot": self.snapshot_size,
+            "by_size": [_site(stat) for stat in stats[: self.top]],
+            "by_count": [_site(stat) for stat in by_count[: self.top]],
+        }
+        info["alloc_path"] = self.path
+
+
+class _Profiler:
+    """
+    Instrument of job, profile the method with cProfile, save pstats file and
+    report functions with top cumulative time.
+    """
+
+    def __init__(self, path: str, top: int):
+        self.path = path
+        self.top = top
+        self.profiler = cProfile.Profile()
+
+    def start(self) -> None:
+        """
+        Start profiling.
+        """
+        self.profiler.enable()
+
+    def stop(self, info: dict) -> None:
+        """
+        Stop profiling and report.
+        """
+        self.profiler.disable()
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self.profiler.dump_stats(self.path)
+
+        stats = pstats.Stats(self.profiler)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE)
+        report = []
+        for func in stats.fcn_list:
+            if len(report) >= self.top:
+                break
+
+            cc, nc, tt, ct, callers = stats.stats[func]
+            filename, line, name = func
+            if _is_runner_frame(func, callers):
+                continue
+            if filename == "~":
+                label = name  # built-in function
+            else:
+                label = f"{os.path.basename(filename)}:{line}({name})"
+
+            ncalls = f"{nc}" if nc == cc else f"{nc}/{cc}"
+            report.append((label, ncalls, 1000.0 * tt, 1000.0 * ct))
+
+        info["profile"] = report
+        info["profile_path"] = self.path
+
+
+# input files of problem modules imported by this process, with their
+# modification times then, to find modules changed since, see Job.reload
+_IMPORTED_INPUTS = {}
+
+
+def _mtime(filepath: str) -> int | None:
+    try:
+        return os.stat(filepath).st_mtime_ns
+
+    except OSError:
+        return None
+
+
+def _forget_changed(module_name: str, preloaded: dict | None = None) -> None:
+    """
+    Forget a problem module, local modules it imports and its data if any of
+    their files changed since imported by this process, so they are imported
+    and loaded again.
+    """
+    inputs = _IMPORTED_INPUTS.get(module_name)
+    if inputs is not None and all(_mtime(f) == t for f, t in inputs.items()):
+        return
+
+    files = RunCache.input_files(module_name)
+    if inputs is not None:
+        paths = {os.path.abspath(f) for f in files}
+        for name, mod in list(sys.modules.items()):
+            path = getattr(mod, "__file__", None)
+            if path is not None and os.path.abspath(path) in paths:
+                del sys.modules[name]
+
+        data_name = f"data.{module_name.rsplit('.', 1)[-1]}"
+        if preloaded is not None:
+            preloaded.pop(data_name, None)
+
+        data.reset()
+        importlib.invalidate_caches()
+
+    _IMPORTED_INPUTS[module_name] = {f: _mtime(f) for f in files}
+
+
+class Job:
+    """
+    Run job
+    """
+
+    fork = True
+
+    def __init__(self, module_name: str, func_name: str):
+        self.module_name = module_name
+        self.func_name = func_name
+        self.func = None
+        self.preload = True
+        self.profile = None
+        self.sample = None
+        self.sample_interval = 5.0
+        self.flamegraph = False
+        self.postmortem = None
+        self.trace_alloc = None
+        self.gc = "on"
+        self.memory_limit = 0
+        self.top = 5
+        self.reload = False
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state["func"] = None  # imported by worker process
+        return state
+
+    def prepare(self, preloaded: dict | None = None) -> None:
+        """
+        Prepare to run in worker process, import the method and preload data
+        of the problem. Data already loaded into `preloaded` is reused.
+        """
+        if self.reload:
+            _forget_changed(self.module_name, preloaded)
+
+        mod = importlib.import_module(self.module_name)
+        self.func = getattr(mod, self.func_name)
+
+        data_name = f"data.{self.module_name.rsplit('.', 1)[-1]}"
+        if preloaded is not None and data_name in preloaded:
+            data.restore(preloaded[data_name])
+
+        else:
+            value = data.try_preload(data_name)
+            if preloaded is not None:
+                preloaded[data_name] = value
+
+        if not self.preload:
+            data.reset()
+
+    def postmortem_path(self) -> str | None:
+        """
+        Path of post-mortem dump if this job timeout.
+        """
+        if not self.postmortem or not _PostMortem.is_supported():
+            return None
+
+        base_name = self.module_name.rsplit(".", 1)[-1]
+        return os.path.join(self.postmortem, f"{base_name}.{self.func_name}.json")
+
+    def instruments(self) -> list:
+        """
+        Instruments to measure the method, each has start() and stop(info).
+        """
+        result = []
+        if _ResourceUsage.is_supported():
+            result.append(_ResourceUsage())
+
+        if self.memory_limit > 0 and _MemoryLimit.is_supported():
+            result.append(_MemoryLimit(self.memory_limit))
+
+        if self.profile:
+            base_name = self.module_name.rsplit(".", 1)[-1]
+            filename = f"{base_name}.{self.func_name}.pstats"
+            result.append(_Profiler(os.path.join(self.profile, filename), self.top))
+
+        if self.trace_alloc:
+            base_name = self.module_name.rsplit(".", 1)[-1]
+            filename = f"{base_name}.{self.func_name}.tracemalloc"
+            result.append(
+                _AllocTracer(os.path.join(self.trace_alloc, filename), self.top)
+            )
+
+        if self.sample and StackSampler.is_supported():
+            base_name = self.module_name.rsplit(".", 1)[-1]
+            path = os.path.join(self.sample, f"{base_name}.{self.func_name}")
+            result.append(
+                _Sampler(path, self.sample_interval, self.flamegraph, self.top)
+            )
+
+        # the last one is started just before the call
+        result.append(_GarbageCollector(self.gc))
+        return result
+
+    def execute(self) -> (int, float, dict):
+        """
+        Run function, the job should be prepared.
+        """
+        result = _NotRunResult()
+        info = {}
+        # armed first, so setting the signal handler is not measured
+        if self.postmortem_path() is not None:
+            _PostMortem.arm(self.postmortem_path())
+
+        instruments = self.instruments()
+        for instrument in instruments:
+            instrument.start()
+
+        time_start = time.perf_counter()
+        try:
+            result = self.func()
+            time_finish = time.perf_counter()
+            dt = 1000.0 * (time_finish - time_start)
+
+        except KeyboardInterrupt:
+            dt = 0.0
+
+        except MemoryError:
+            dt = 1000.0 * (time.perf_counter() - time_start)
+            result = _OutOfMemoryResult()
+
+        finally:
+            for instrument in reversed(instruments):
+                instrument.stop(info)
+            _PostMortem.disarm()
+
+        if isinstance(result, _OutOfMemoryResult):
+            info["oom"] = {"peak": _peak_rss()}
+
+        return result, dt, info
+
+    def run(self) -> (int, float, dict):
+        """
+        Run function
+        """
+        self.prepare()
+        return self.execute()
+
+
+class _CalibrateJob(Job):
+    """
+    Job to measure overhead of the timer and of timing a call as execute()
+    does, runs in the template process of fork server.
+    """
+
+    fork = False
+    REPEAT = 2000
+
+    def __init__(self):
+        super().__init__("", "")
+
+    @staticmethod
+    def _empty() -> None:
+        pass
+
+    def run(self) -> (dict, float, dict):
+        time_start = time.perf_counter()
+        timer_ns, call_ns = None, math.inf
+        for _ in range(self.REPEAT):
+            t0 = time.perf_counter_ns()
+            t1 = time.perf_counter_ns()
+            timer_ns = t1 - t0 if timer_ns is None else min(timer_ns, t1 - t0)
+
+        for _ in range(self.REPEAT):
+            t0 = time.perf_counter()
+            self._empty()
+            t1 = time.perf_counter()
+            call_ns = min(call_ns, 1e9 * (t1 - t0))
+
+        dt = 1000.0 * (time.perf_counter() - time_start)
+        return {"timer_ns": timer_ns, "call_ns": call_ns}, dt, {}
+
+
+class _DescribeJob(Job):
+    """
+    Job to describe a problem module, runs in the template process of fork
+    server, so the module is imported there.
+    """
+
+    fork = False
+
+    def __init__(self, module_name: str):
+        super().__init__(module_name, "")
+
+    def run(self) -> (dict | Exception, float, dict):
+        """
+        Describe the problem, import errors are returned as result.
+        """
+        time_start = time.perf_counter()
+        if self.reload:
+            _forget_changed(self.module_name)
+
+        try:
+            result = describe_problem(self.module_name)
+
+        except (ImportError, SyntaxError) as ex:
+            result = ex
+
+        return result, 1000.0 * (time.perf_counter() - time_start), {}
+
+
+class _Worker:
+    """
+    Worker of runner, runs one job at a time and posts its result to the
+    events queue of runner.
+    """
+
+    # the job runs on this host, so host conditions apply to it
+    local = True
+
+    def __init__(self, events: queue.SimpleQueue):
+        self.events = events
+        self.serial = 0
+        self.job = None
+        self.tag = None
+        self.time_start = 0.0
+        self.deadline = None
+        # most jobs of runner running on this host at once while the job runs
+        self.crowd = 0
+        self.cpu = None
+        self.nice = 0
+
+    def is_busy(self) -> bool:
+        """
+        Is a job running on this worker.
+        """
+        return self.job is not None
+
+    def job_pid(self) -> int | None:
+        """
+        ID of process running the job, None if unknown.
+        """
+        return None
+
+    def start(self) -> None:
+        """
+        Start the worker process, without waiting for it.
+        """
+        raise NotImplementedError
+
+    def warm_up(self) -> None:
+        """
+        Wait until the worker process is ready.
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """
+        Close the worker process.
+        """
+        raise NotImplementedError
+
+    def _tune(self, pid: int) -> None:
+        """
+        Pin the worker process to its CPU and set its niceness, processes
+        forked from it inherit both.
+        """
+        if self.cpu is not None:
+            os.sched_setaffinity(pid, {self.cpu})
+
+        if self.nice != 0:
+            try:
+                os.setpriority(os.PRIO_PROCESS, pid, self.nice)
+
+            except OSError as ex:
+                print(f"Failed to set niceness of worker process: {ex}")
+                self.nice = 0
+
+    def reset(self) -> None:
+        """
+        Kill the worker process and start a new one.
+        """
+        self.close()
+        self.start()
+        self.warm_up()
+
+    def kill(self) -> None:
+        """
+        Kill the running job, make the worker ready for next job.
+        """
+        self.reset()
+
+    def recycle(self) -> None:
+        """
+        Replace the process which ran out of memory, its heap may stay
+        fragmented or swapped out.
+        """
+        self.reset()
+
+    def lost_status(self) -> int | None:
+        """
+        Exit code of the worker process if it died while running a job,
+        e.g. killed by the OOM killer, None if it is alive.
+        """
+        return None
+
+    def submit(self, job: Job, tag: object, timeout: float = 0.0) -> None:
+        """
+        Run a job on this worker, the result is posted to events queue.
+        """
+        self.serial += 1
+        self.job = job
+        self.tag = tag
+        self.time_start = time.perf_counter()
+        self.deadline = None
+        self.crowd = 0
+        if timeout > 0.0:
+            self.deadline = self.time_start + timeout / 1000.0
+
+        self._dispatch(job, self.serial)
+
+    def _dispatch(self, job: Job, serial: int) -> None:
+        raise NotImplementedError
+
+    def _post(self, serial: int, success: bool, value: object) -> None:
+        self.events.put((self, serial, success, value))
+
+    def finish(self) -> object:
+        """
+        Mark the running job finished, return its tag.
+        """
+        tag = self.tag
+        self.job = None
+        self.tag = None
+        self.deadline = None
+        return tag
+
+
+class BenchResult:
+    """
+    Result of a benchmark job, samples are time costs of one call.
+    """
+
+    def __init__(self, result: int, samples: list[float], loops: int):
+        self.result = result
+        self.samples = samples
+        self.loops = loops
+
+
+class BenchStats:
+    """
+    Statistics of benchmark samples, in milliseconds.
+    """
+
+    def __init__(self, samples: list[float], loops: int):
+        self.samples = samples
+        self.loops = loops
+        self.min = min(samples)
+        self.median = statistics.median(samples)
+        self.iqr = 0.0
+        self.stdev = 0.0
+        self.cov = 0.0
+        if len(samples) > 1:
+            q1, _, q3 = statistics.quantiles(samples, n=4, method="inclusive")
+            self.iqr = q3 - q1
+            self.stdev = statistics.stdev(samples)
+            mean = statistics.fmean(samples)
+            if mean > 0.0:
+                self.cov = self.stdev / mean
+
+
+class BenchJob(Job):
+    """
+    Job to benchmark a method, with warmup calls and timeit style auto-ranged
+    loops, so that each sample lasts long enough to measure reliably.
+    """
+
+    warmup: int = 1
+    repeat: int = 5
+    min_time: float = 200.0
+
+    def _time_loops(self, loops: int) -> float:
+        func = self.func
+        time_start = time.perf_counter()
+        for _ in range(loops):
+            func()
+
+        return 1000.0 * (time.perf_counter() - time_start)
+
+    def _auto_range(self) -> tuple[object, int, float]:
+        """
+        Find loops such that total time >= min_time, in sequence 1, 2, 5,
+        10, 20, 50, ... as timeit does. Result of the method is taken from
+        the first call, timed alone.
+        """
+        time_start = time.perf_counter()
+        result = self.func()
+        dt = 1000.0 * (time.perf_counter() - time_start)
+        i, loops = 1, 1
+        while dt < self.min_time:
+            for j in (2, 5, 10):
+                loops = i * j
+                dt = self._time_loops(loops)
+                if dt >= self.min_time:
+                    break
+
+            i *= 10
+
+        return result, loops, dt
+
+    def execute(self) -> (BenchResult | _NotRunResult, float, dict):
+        info = {}
+        collector = _GarbageCollector(self.gc)
+        collector.start()
+        time_start = time.perf_counter()
+        try:
+            for _ in range(self.warmup):
+                self.func()
+
+            result, loops, dt = self._auto_range()
+            samples = [dt / loops]
+            for _ in range(self.repeat - 1):
+                samples.append(self._time_loops(loops) / loops)
+
+            dt = 1000.0 * (time.perf_counter() - time_start)
+            return BenchResult(result, samples, loops), dt, info
+
+        except KeyboardInterrupt:
+            return _NotRunResult(), 0.0, info
+
+        finally:
+            collector.stop(info)
+
+
+class _PoolWorker(_Worker):
+    """
+    Worker with a process pool of only one process, so a timeout job can be
+    killed without disturbing jobs on other workers.
+    """
+
+    pool: multiprocessing.Pool
+
+    def __init__(self, events: queue.SimpleQueue):
+        super().__init__(events)
+        self.pool = None
+        self.pid = None
+        self.process = None
+
+    def job_pid(self) -> int | None:
+        return self.pid
+
+    def start(self) -> None:
+        self.pool = multiprocessing.Pool(processes=1)
+
+    def warm_up(self) -> None:
+        self.pid = self.pool.apply(os.getpid)
+        self._tune(self.pid)
+        for process in self.pool._pool:  # pylint: disable=protected-access
+            if process.pid == self.pid:
+                self.process = process
+
+    def close(self) -> None:
+        self.job = None
+        self.tag = None
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool.close()
+            self.pool = None
+            self.process = None
+
+    def lost_status(self) -> int | None:
+        # pool replaces a dead process silently, the job is lost with it
+        return self.process.exitcode if self.process is not None else None
+
+    def _dispatch(self, job: Job, serial: int) -> None:
+        def _on_result(value):
+            self._post(serial, True, value)
+
+        def _on_error(ex):
+            self._post(serial, False, ex)
+
+        self.pool.apply_async(job.run, callback=_on_result, error_callback=_on_error)
+
+
+def _fork_server_main(conn) -> None:
+    """
+    Main loop of fork server, which imports problem modules and preloads their
+    data as a template, then forks a fresh child process for each job.
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    preloaded = {}
+    while True:
+        try:
+            command, serial, job = conn.recv()
+
+        except (EOFError, OSError):
+            break
+
+        if command == "ping":
+            conn.send(("pong", serial, None))
+            continue
+
+        if command != "run":
+            break
+
+        if not job.fork:
+            try:
+                conn.send(("done", serial, (True, job.run(), None)))
+
+            except Exception as ex:  # pylint: disable=broad-exception-caught
+                conn.send(("done", serial, (False, ex, traceback.format_exc())))
+
+            continue
+
+        try:
+            job.prepare(preloaded)
+
+        except Exception as ex:  # pylint: disable=broad-exception-caught
+            conn.send(("done", serial, (False, ex, traceback.format_exc())))
+            continue
+
+        reader, writer = multiprocessing.Pipe(duplex=False)
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGINT, signal.default_int_handler)
+            reader.close()
+            try:
+                writer.send((True, job.execute(), None))
+
+            except BaseException as ex:  # pylint: disable=broad-exception-caught
+                writer.send((False, ex, traceback.format_exc()))
+
+            finally:
+                os._exit(0)  # pylint: disable=protected-access
+
+        writer.close()
+        conn.send(("started", serial, pid))
+        try:
+            message = reader.recv()
+
+        except EOFError:
+            message = None
+
+        reader.close()
+        _, status, usage = os.wait4(pid, 0)
+        if message is None:
+            peak = usage.ru_maxrss * 1024 // _ResourceUsage.MAXRSS_UNIT
+            conn.send(("lost", serial, (status, peak, job.memory_limit)))
+        else:
+            conn.send(("done", serial, message))
+
+
+class _ForkWorker(_Worker):
+    """
+    Worker with a fork server, each job runs in a fresh process forked from
+    a template process, so module level state never leaks between jobs and
+    a timeout only kills the forked process.
+    """
+
+    def __init__(self, events: queue.SimpleQueue):
+        super().__init__(events)
+        self.conn = None
+        self.process = None
+        self.child_pid = None
+
+    def start(self) -> None:
+        ctx = multiprocessing.get_context("fork")
+        self.conn, server_conn = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_fork_server_main, args=(server_conn,), daemon=True
+        )
+        self.process.start()
+        server_conn.close()
+
+    def warm_up(self) -> None:
+        self.conn.send(("ping", 0, None))
+        self.conn.recv()
+        self._tune(self.process.pid)
+        reader = threading.Thread(
+            target=self._read_events, args=(self.conn,), daemon=True
+        )
+        reader.start()
+
+    def close(self) -> None:
+        self._kill_child()
+        self.job = None
+        self.tag = None
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+        if self.process is not None:
+            self.process.terminate()
+            self.process.join()
+            self.process = None
+
+    def job_pid(self) -> int | None:
+        return self.child_pid
+
+    def kill(self) -> None:
+        if self.child_pid is None:
+            # the fork server itself is stuck, e.g. importing the module
+            self.reset()
+            return
+
+        self._kill_child()
+
+    def recycle(self) -> None:
+        # the process ran out of memory is gone already
+        pass
+
+    def lost_status(self) -> int | None:
+        return self.process.exitcode if self.process is not None else None
+
+    def _kill_child(self) -> None:
+        pid, self.child_pid = self.child_pid, None
+        if pid is None:
+            return
+
+        try:
+            os.kill(pid, signal.SIGKILL)
+
+        except ProcessLookupError:
+            pass
+
+    def _dispatch(self, job: Job, serial: int) -> None:
+        self.child_pid = None
+        self.conn.send(("run", serial, job))
+
+    def _read_events(self, conn) -> None:
+        while True:
+            try:
+                command, serial, value = conn.recv()
+
+            except (EOFError, OSError):
+                break
+
+            if command == "started":
+                if serial == self.serial:
+                    self.child_pid = value
+
+            elif command == "done":
+                success, value, trace = value
+                if not success:
+                    value.__cause__ = RemoteTraceback(f'\n"""\n{trace}"""')
+
+                self._post(serial, success, value)
+
+            elif command == "lost":
+                dt = 1000.0 * (time.perf_counter() - self.time_start)
+                status, peak, memory_limit = value
+                status = os.waitstatus_to_exitcode(status)
+                result, info = _lost_result(status, memory_limit, peak)
+                self._post(serial, True, (result, dt, info))
+
+
+BACKENDS = {"pool": _PoolWorker}
+if hasattr(os, "fork"):
+    BACKENDS["fork"] = _ForkWorker
+
+# backend of workers kept between runs, by run server and run --watch, a
+# forked process per method keeps module state of a run from leaking into
+# the next, such as caches filled by methods
+KEPT_BACKEND = "fork" if "fork" in BACKENDS else "pool"
+
+
+def _lost_result(
+    status: int, memory_limit: int = 0, peak: int | None = None
+) -> tuple[object, dict]:
+    """
+    Result and info of a job whose worker process died with exit `status`,
+    negative for a signal. A SIGKILL is taken as from the OOM killer only if
+    the method has a memory limit and its peak RSS reached the limit, it may
+    be a kill of timeout or by hand otherwise.
+    """
+    if status == -signal.SIGKILL and memory_limit > 0:
+        if peak is not None and peak >= memory_limit:
+            return _OutOfMemoryResult(), {"oom": {"peak": peak, "killed": True}}
+
+    if status >= 0:
+        return None, {"lost": f"exited with {status}"}
+
+    try:
+        return None, {"lost": f"killed by {signal.Signals(-status).name}"}
+
+    except ValueError:
+        return None, {"lost": f"killed by signal {-status}"}
+
+
+def _remote_trace(ex: BaseException) -> str:
+    if isinstance(ex.__cause__, RemoteTraceback):
+        return ex.__cause__.tb.strip('\n"')
+
+    return "".join(traceback.format_exception(type(ex), ex, ex.__traceback__))
+
+
+class _RemoteWorker(_Worker):
+    """
+    Worker driving one worker of a worker agent over the network, each
+    connection to the agent is one worker. Timeout is still enforced by the
+    runner, which asks the agent to kill the job.
+    """
+
+    local = False
+
+    def __init__(self, events: queue.SimpleQueue, address: tuple[str, int], authkey):
+        super().__init__(events)
+        self.address = address
+        self.authkey = authkey
+        self.conn = None
+        self.slots = 1
+        self.lost = False
+
+    def start(self) -> None:
+        self.conn = Client(self.address, authkey=self.authkey)
+        self.lost = False
+
+    def warm_up(self) -> None:
+        self.conn.send(("ping", 0, None))
+        _, _, self.slots = self.conn.recv()
+        reader = threading.Thread(
+            target=self._read_events, args=(self.conn,), daemon=True
+        )
+        reader.start()
+
+    def close(self) -> None:
+        self.job = None
+        self.tag = None
+        conn, self.conn = self.conn, None
+        if conn is not None:
+            try:
+                conn.send(("close", 0, None))
+
+            except OSError:
+                pass
+
+            conn.close()
+
+    def kill(self) -> None:
+        self._send(("kill", self.serial, None))
+
+    def recycle(self) -> None:
+        # the agent recycles its own worker
+        pass
+
+    def lost_status(self) -> int | None:
+        return -1 if self.lost else None
+
+    def _dispatch(self, job: Job, serial: int) -> None:
+        self._send(("run", serial, job))
+
+    def _send(self, message: tuple) -> None:
+        try:
+            self.conn.send(message)
+
+        except OSError:
+            self.lost = True
+
+    def _read_events(self, conn) -> None:
+        while True:
+            try:
+                command, serial, value = conn.recv()
+
+            except (EOFError, OSError):
+                # closed by the agent, not by close()
+                self.lost = conn is self.conn
+                break
+
+            if command == "done":
+                success, value, trace = value
+                if not success:
+                    value.__cause__ = RemoteTraceback(f'\n"""\n{trace}"""')
+
+                self._post(serial, success, value)
+
+
+class WorkerAgent:
+    """
+    Agent running methods for runners on other hosts, see `run --workers`.
+    Each connection of a runner is served by a local worker, problems are
+    imported from the checkout of the agent.
+    """
+
+    def __init__(self, address: tuple[str, int], authkey: bytes, jobs: int, backend):
+        self.address = address
+        self.authkey = authkey
+        self.jobs = jobs
+        self.backend = backend
+        self.workers = set()
+
+    def serve_forever(self) -> None:
+        """
+        Accept runners until interrupted.
+        """
+        with Listener(self.address, authkey=self.authkey) as listener:
+            host, port = listener.address[:2]
+            print(f"Worker agent listening on {host}:{port} with {self.jobs} jobs")
+            try:
+                while True:
+                    self._accept(listener)
+
+            finally:
+                self.close()
+
+    def close(self) -> None:
+        """
+        Close worker processes of all connections.
+        """
+        for worker in list(self.workers):
+            worker.close()
+
+    def _accept(self, listener: Listener) -> None:
+        try:
+            conn = listener.accept()
+
+        except (OSError, multiprocessing.AuthenticationError) as ex:
+            print(f"Rejected connection: {ex}")
+            return
+
+        server = threading.Thread(target=self._serve, args=(conn,), daemon=True)
+        server.start()
+
+    @staticmethod
+    def _read_commands(conn, events: queue.SimpleQueue) -> None:
+        """
+        Post commands of the runner to events queue, next to events of the
+        worker, but with None as the worker.
+        """
+        while True:
+            try:
+                command, serial, job = conn.recv()
+
+            except (EOFError, OSError):
+                events.put((None, 0, "close", None))
+                break
+
+            events.put((None, serial, command, job))
+
+    def _serve(self, conn) -> None:
+        """
+        Serve one connection, it is one worker of the runner.
+        """
+        events = queue.SimpleQueue()
+        worker = BACKENDS[self.backend](events)
+        self.workers.add(worker)
+        worker.start()
+        worker.warm_up()
+        reader = threading.Thread(
+            target=self._read_commands, args=(conn, events), daemon=True
+        )
+        reader.start()
+        try:
+            while self._handle(conn, worker, events):
+                pass
+
+        except (EOFError, OSError):
+            pass
+
+        finally:
+            self.workers.discard(worker)
+            worker.close()
+            conn.close()
+
+    def _handle(self, conn, worker: _Worker, events: queue.SimpleQueue) -> bool:
+        """
+        Handle commands of the runner and events of the worker for at most
+        the liveness interval, return False when the connection is closed.
+        """
+        try:
+            source, serial, success, value = events.get(
+                timeout=Runner.LIVENESS_INTERVAL
+            )
+
+        except queue.Empty:
+            source, serial = worker, None
+
+        if source is None:
+            command, job = success, value
+            if command == "run":
+                worker.submit(job, serial)
+
+            elif command == "kill":
+                if worker.is_busy() and worker.tag == serial:
+                    worker.finish()
+                    worker.kill()
+
+            elif command == "ping":
+                conn.send(("pong", serial, self.jobs))
+
+            else:
+                return False
+
+        elif serial == worker.serial and worker.is_busy():
+            tag = worker.finish()
+            trace = None
+            if not success:
+                trace = _remote_trace(value)
+
+            elif isinstance(value[0], _OutOfMemoryResult):
+                worker.recycle()
+
+            conn.send(("done", tag, (success, value, trace)))
+
+        status = worker.lost_status() if worker.is_busy() else None
+        if status is not None:
+            dt = 1000.0 * (time.perf_counter() - worker.time_start)
+            memory_limit = worker.job.memory_limit
+            tag = worker.finish()
+            worker.reset()
+            result, info = _lost_result(status, memory_limit)
+            conn.send(("done", tag, (True, (result, dt, info), None)))
+
+        return True
+
+
+class HostMonitor:
+    """
+    Monitor of host conditions, samples busy, stolen and iowait CPU time from
+    /proc/stat, CPU time of the runner and its workers from /proc and CPU
+    frequency from sysfs in a background thread, so time costs measured
+    under bad conditions can be flagged as noisy.
+    """
+
+    INTERVAL = 0.25
+    # CPU time ratios are of this many intervals, CPU time of processes is
+    # counted in clock ticks, too coarse for a single interval
+    HORIZON = 4
+
+    def __init__(self, interval: float = INTERVAL):
+        self.interval = interval
+        self.samples = []
+        self.cpus = os.cpu_count() or 1
+        self.usable_cpus = usable_cpu_count()
+        # conditions of the first interval, None until sampled
+        self.initial = None
+        # latest readings of CPU times of host and of the runner
+        self._counters = collections.deque(maxlen=self.HORIZON + 1)
+        self._stopped = threading.Event()
+        self._thread = None
+
+    @staticmethod
+    def _read_cpu_times() -> list[int] | None:
+        try:
+            with open("/proc/stat", encoding="ascii") as f:
+                fields = f.readline().split()
+
+        except OSError:
+            return None
+
+        if len(fields) < 9 or fields[0] != "cpu":
+            return None
+
+        # user, nice, system, idle, iowait, irq, softirq, steal; guest time
+        # is counted in user time already
+        return [int(value) for value in fields[1:9]]
+
+    @staticmethod
+    def _read_own_times() -> int | None:
+        """
+        CPU time of this process and its descendants in clock ticks, like
+        /proc/stat, with the time of their children waited for, so worker
+        processes and processes forked by them are all counted.
+        """
+        children = collections.defaultdict(list)
+        times = {}
+        try:
+            names = os.listdir("/proc")
+
+        except OSError:
+            return None
+
+        for name in names:
+            if not name.isdigit():
+                continue
+
+            try:
+                with open(f"/proc/{name}/stat", encoding="ascii") as f:
+                    # command name in parentheses may have spaces
+                    fields = f.read().rpartition(")")[2].split()
+
+            except (OSError, ValueError):
+                continue  # gone already
+
+            pid = int(name)
+            children[int(fields[1])].append(pid)
+            # utime, stime, cutime, cstime
+            times[pid] = sum(int(value) for value in fields[11:15])
+
+        total = 0
+        pending = [os.getpid()]
+        while len(pending) > 0:
+            pid = pending.pop()
+            total += times.get(pid, 0)
+            pending.extend(children.get(pid, []))
+
+        return total
+
+    @staticmethod
+    def _read_frequency() -> float | None:
+        """
+        Ratio of current frequency of the fastest CPU to its maximum.
+        """
+        ratios = []
+        for path in glob.glob("/sys/devices/system/cpu/cpu[0-9]*/cpufreq"):
+            try:
+                with open(os.path.join(path, "scaling_cur_freq"), "rb") as f:
+                    current = int(f.read())
+
+                with open(os.path.join(path, "cpuinfo_max_freq"), "rb") as f:
+                    maximum = int(f.read())
+
+            except (OSError, ValueError):
+                continue
+
+            if maximum > 0:
+                ratios.append(current / maximum)
+
+        return max(ratios) if len(ratios) > 0 else None
+
+    def _read_counters(self) -> tuple[list[int] | None, int | None]:
+        return self._read_cpu_times(), self._read_own_times()
+
+    def _ratios(self, before: tuple, after: tuple) -> dict:
+        """
+        Ratios of busy, iowait and stolen CPU time of host, and CPUs which
+        processes other than the runner kept busy, between two readings of
+        counters.
+        """
+        (cpu_before, own_before), (cpu_after, own_after) = before, after
+        if cpu_before is None or cpu_after is None:
+            return {}
+
+        delta = [b - a for a, b in zip(cpu_before, cpu_after)]
+        total = sum(delta)
+        if total <= 0:
+            return {}
+
+        # all but idle, iowait and stolen time, stolen time is flagged apart
+        busy = total - delta[3] - delta[4] - delta[7]
+        result = {
+            "busy": busy / total,
+            "iowait": delta[4] / total,
+            "steal": delta[7] / total,
+        }
+        if own_before is not None and own_after is not None:
+            others = max(0, busy - (own_after - own_before)) / total
+            result["others"] = others * self.cpus
+
+        return result
+
+    def sample(self) -> dict:
+        """
+        Sample host conditions, CPU time ratios are of the time since the
+        earliest of latest HORIZON samples.
+        """
+        conditions = {}
+        self._counters.append(self._read_counters())
+        if len(self._counters) > 1:
+            conditions.update(self._ratios(self._counters[0], self._counters[-1]))
+
+        frequency = self._read_frequency()
+        if frequency is not None:
+            conditions["freq"] = frequency
+
+        if self.initial is None and len(self._counters) == self._counters.maxlen:
+            self.initial = conditions
+
+        return conditions
+
+    def start(self) -> None:
+        """
+        Start sampling in background, conditions of the first HORIZON
+        intervals are kept as initial, without waiting for them.
+        """
+        self._stopped.clear()
+        self.samples.append((time.perf_counter(), self.sample()))
+        self._thread = threading.Thread(target=self._main, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop sampling.
+        """
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _main(self) -> None:
+        while not self._stopped.wait(self.interval):
+            conditions = self.sample()
+            self.samples.append((time.perf_counter(), conditions))
+
+    def window(self, time_start: float, time_finish: float, jobs: int = 1) -> dict:
+        """
+        Worst host conditions sampled while measuring, including the latest
+        sample before, so methods shorter than the interval are assessed too.
+        `jobs` is the most jobs of the runner running at once in it.
+        """
+        result = {"jobs": jobs, "cpus": self.usable_cpus}
+        samples = list(self.samples)
+        first = 0
+        while first + 1 < len(samples) and samples[first + 1][0] <= time_start:
+            first += 1
+
+        for when, conditions in samples[first:]:
+            for key, value in conditions.items():
+                worst = min if key == "freq" else max
+                result[key] = worst(result.get(key, value), value)
+
+            if when >= time_finish:
+                break
+
+        return result
+
+    @staticmethod
+    def assess(conditions: dict) -> list[str]:
+        """
+        Reasons why host conditions make time costs noisy.
+        """
+        reasons = []
+        if conditions.get("jobs", 0) > conditions.get("cpus", math.inf):
+            reasons.append(f"jobs {conditions['jobs']}/{conditions['cpus']} cpus")
+
+        busy, others = conditions.get("busy", 0.0), conditions.get("others", 0.0)
+        if busy > NOISE_BUSY and others > NOISE_OTHERS:
+            reasons.append(f"others {others:.1f} cpus")
+
+        if conditions.get("steal", 0.0) > NOISE_STEAL:
+            reasons.append(f"steal {conditions['steal']:.0%}")
+
+        if conditions.get("iowait", 0.0) > NOISE_IOWAIT:
+            reasons.append(f"iowait {conditions['iowait']:.0%}")
+
+        if conditions.get("freq", 1.0) < NOISE_FREQ:
+            reasons.append(f"freq {conditions['freq']:.0%}")
+
+        return reasons
+
+
+class Runner:
+    """
+    Runner of all problem solvers, with managed process pool.
+    """
+
+    workers: list[_Worker]
+
+    # how often to check if a worker process died silently, in seconds
+    LIVENESS_INTERVAL = 1.0
+
+    def __init__(
+        self,
+        jobs: int = 1,
+        backend: str = "pool",
+        pin: list[int] | None = None,
+        nice: int = 0,
+        monitor: HostMonitor | None = None,
+        remote: list[tuple[str, int]] | None = None,
+        authkey: bytes | None = None,
+    ):
+        self.jobs = max(1, jobs)
+        self.backend = backend
+        self.pin = pin
+        self.nice = nice
+        self.monitor = monitor
+        self.remote = remote
+        self.authkey = authkey
+        self.call_overhead = 0.0
+        self.cancelled = set()
+        # workers of a long-lived runner reload problem modules changed
+        self.reload = False
+        # held by a run of run_problems()
+        self.lock = threading.Lock()
+        self.workers = []
+        self.events = queue.SimpleQueue()
+
+    def close(self) -> None:
+        """
+        Close the process pool.
+        """
+        for worker in self.workers:
+            worker.close()
+
+        self.workers = []
+
+    def reset_pool(self) -> None:
+        """
+        Reset the process pool.
+        """
+        self.close()
+        if self.remote:
+            self.workers = self._connect_agents()
+            self.jobs = len(self.workers)
+            return
+
+        worker_type = BACKENDS[self.backend]
+        self.workers = [worker_type(self.events) for _ in range(self.jobs)]
+        for i, worker in enumerate(self.workers):
+            if self.pin:
+                worker.cpu = self.pin[i % len(self.pin)]
+            worker.nice = self.nice
+            worker.start()
+
+        for worker in self.workers:
+            worker.warm_up()
+
+    def _connect_agents(self) -> list[_Worker]:
+        """
+        Connect to worker agents, as many workers of each agent as its jobs.
+        """
+        workers = []
+        for address in self.remote:
+            # the first connection tells how many jobs the agent has
+            slots = None
+            while slots != 0:
+                worker = _RemoteWorker(self.events, address, self.authkey)
+                workers.append(worker)
+                worker.start()
+                worker.warm_up()
+                slots = (worker.slots if slots is None else slots) - 1
+
+        return workers
+
+    def calibrate(self) -> dict:
+        """
+        Measure overhead of the timer, of timing a call and of dispatching a
+        job to a worker and back. The call overhead is subtracted from time
+        cost of methods solved afterwards, which matters for methods that
+        finish in microseconds.
+        """
+        time_start = time.perf_counter()
+        for _, result, _, dt, _ in self.run_jobs([(None, _CalibrateJob(), 0.0)]):
+            round_trip = 1000.0 * (time.perf_counter() - time_start) - dt
+            self.call_overhead = result["call_ns"] / 1e6
+            return {**result, "dispatch_ms": round_trip}
+
+        return {}
+
+    def describe_problems(
+        self, module_names: Iterable[str], timeout: float = 0.0
+    ) -> Iterator[tuple[str, dict | Exception | None]]:
+        """
+        Describe problem modules on workers, yield (module_name, description)
+        in the given order, description is None if timeout.
+        """
+        module_names = list(module_names)
+        jobs = [(i, _DescribeJob(name), timeout) for i, name in enumerate(module_names)]
+        results = {}
+        next_index = 0
+        for index, result, is_timeout, _, info in self.run_jobs(jobs):
+            if isinstance(result, _ErrorResult):
+                # module raised while imported
+                result = ImportError(info["error"].strip().splitlines()[-1])
+
+            results[index] = None if is_timeout else result
+            while next_index in results:
+                yield module_names[next_index], results.pop(next_index)
+                next_index += 1
+
+    def abort(self) -> None:
+        """
+        Kill jobs left running by an abandoned run_jobs(), so the workers are
+        ready for next run.
+        """
+        for worker in self.workers:
+            if worker.is_busy():
+                worker.finish()
+                worker.kill()
+
+        self.cancelled.clear()
+
+    def cancel(self, tags: Iterable[object]) -> None:
+        """
+        Cancel jobs of run_jobs() by their tags, running ones are killed.
+        """
+        self.cancelled.update(tags)
+
+    def _cancel_jobs(
+        self, pending: collections.deque
+    ) -> Iterator[tuple[object, int, bool, float, dict]]:
+        for worker in self.workers:
+            if worker.is_busy() and worker.tag in self.cancelled:
+                dt = 1000.0 * (time.perf_counter() - worker.time_start)
+                tag = worker.finish()
+                worker.kill()
+                yield tag, _NotRunResult(), False, dt, {"cancelled": True}
+
+        for tag, job, timeout in list(pending):
+            if tag in self.cancelled:
+                pending.remove((tag, job, timeout))
+                yield tag, _NotRunResult(), False, 0.0, {"cancelled": True}
+
+    def run_jobs(
+        self, jobs: Iterable[tuple[object, Job, float]], stop_at: float | None = None
+    ) -> Iterator[tuple[object, int, bool, float, dict]]:
+        """
+        Run jobs on all workers, each job is a tuple of (tag, job, timeout).
+        Yield (tag, result, is_timeout, time_cost, info) in finish order.
+        Jobs not started by time `stop_at` are not run, and yielded with
+        "skipped" in info. Jobs cancelled while running are yielded with
+        "cancelled" in info.
+        """
+        pending = collections.deque(jobs)
+        try:
+            while len(pending) > 0 or any(w.is_busy() for w in self.workers):
+                if stop_at is not None and time.perf_counter() > stop_at:
+                    while len(pending) > 0:
+                        tag, _, _ = pending.popleft()
+                        yield tag, _NotRunResult(), False, 0.0, {"skipped": True}
+
+                if len(self.cancelled) > 0:
+                    yield from self._cancel_jobs(pending)
+
+                for worker in self.workers:
+                    if len(pending) == 0:
+                        break
+
+                    if not worker.is_busy():
+                        tag, job, timeout = pending.popleft()
+                        job.reload = self.reload
+                        worker.submit(job, tag, timeout)
+
+                running = [w for w in self.workers if w.local and w.is_busy()]
+                for worker in running:
+                    worker.crowd = max(worker.crowd, len(running))
+
+                yield from self._wait_finished()
+
+        finally:
+            self.cancelled.clear()
+
+    def _wait_finished(self) -> Iterator[tuple[object, int, bool, float, dict]]:
+        """
+        Wait until at least one job is finished or timeout.
+        """
+        deadlines = [w.deadline for w in self.workers if w.deadline is not None]
+        deadlines.append(time.perf_counter() + self.LIVENESS_INTERVAL)
+        wait_params = {"timeout": max(0.0, min(deadlines) - time.perf_counter())}
+
+        events = []
+        try:
+            events.append(self.events.get(**wait_params))
+            while True:
+                events.append(self.events.get_nowait())
+
+        except queue.Empty:
+            pass
+
+        for worker, serial, success, value in events:
+            if serial != worker.serial or not worker.is_busy():
+                continue  # late result of a killed job
+
+            time_start, crowd = worker.time_start, worker.crowd
+            tag = worker.finish()
+            if not success:
+                # the method raised, report it and go on with other jobs
+                dt = 1000.0 * (time.perf_counter() - time_start)
+                value = (_ErrorResult(), dt, {"error": _remote_trace(value)})
+
+            result, dt, info = value
+            if self.monitor is not None and worker.local:
+                time_finish = time.perf_counter()
+                info["host"] = self.monitor.window(time_start, time_finish, crowd)
+
+            if isinstance(result, _OutOfMemoryResult):
+                worker.recycle()
+
+            yield tag, result, False, dt, info
+
+        now = time.perf_counter()
+        for worker in list(self.workers):
+            status = worker.lost_status() if worker.is_busy() else None
+            if status is None:
+                continue
+
+            dt = 1000.0 * (now - worker.time_start)
+            memory_limit = worker.job.memory_limit
+            tag = worker.finish()
+            if worker.local:
+                worker.reset()
+                result, info = _lost_result(status, memory_limit)
+            else:
+                # the worker agent is gone or unreachable, and connecting to
+                # it again may hang, go on with other workers
+                self._drop_worker(worker)
+                result, info = None, {"lost": "worker agent lost"}
+
+            yield tag, result, False, dt, info
+
+        for worker in self.workers:
+            if worker.deadline is None or worker.deadline > now:
+                continue
+
+            dt = 1000.0 * (now - worker.time_start)
+            info = self._postmortem(worker, dt)
+            tag = worker.finish()
+            worker.kill()
+            yield tag, _TimeoutResult(), True, dt, info
+
+    def _drop_worker(self, worker: _RemoteWorker) -> None:
+        worker.close()
+        self.workers.remove(worker)
+        self.jobs = len(self.workers)
+        host, port = worker.address
+        print(f"Lost a worker of agent {host}:{port}")
+        if len(self.workers) == 0:
+            raise RuntimeError("All worker agents are lost")
+
+    @staticmethod
+    def _postmortem(worker: _Worker, dt: float) -> dict:
+        """
+        Ask worker of a timeout job for its stack and samples before killed.
+        """
+        job, pid = worker.job, worker.job_pid()
+        path = job.postmortem_path()
+        if path is None or pid is None:
+            return {}
+
+        try:
+            os.remove(path)
+
+        except OSError:
+            pass
+
+        try:
+            os.kill(pid, signal.SIGUSR2)
+
+        except OSError:
+            return {}
+
+        deadline = time.perf_counter() + (POSTMORTEM_TIME + 500.0) / 1000.0
+        while not os.path.exists(path) and time.perf_counter() < deadline:
+            time.sleep(0.01)
+
+        try:
+            with open(path, encoding="utf-8") as f:
+                content = json.load(f)
+
+        except (OSError, ValueError):
+            return {}
+
+        text_path = f"{os.path.splitext(path)[0]}.txt"
+        with open(text_path, "w", encoding="utf-8") as f:
+            f.write(_postmortem_text(f"{job.module_name}:{job.func_name}", dt, content))
+
+        return {"postmortem": content, "postmortem_path": text_path}
+
+    def solve_problems(
+        self,
+        problems: Iterable[tuple[ProblemId | None, ProblemSolver]],
+        conf: RunConfigure,
+        cache: RunCache | None = None,
+        schedule: Schedule | None = None,
+    ) -> Iterator[ProblemSolver]:
+        """
+        Solve problems with methods running on all workers, yield solved
+        problems in the given order as soon as all their methods finished.
+        Methods with results in cache are not run. Methods are dispatched in
+        the order planned by schedule if any, otherwise in the given order.
+        """
+        problems = list(problems)
+        remaining = []
+        jobs = []
+        planned = []
+        for index, (pid, problem) in enumerate(problems):
+            name = pid.method if pid is not None else None
+            count = 0
+            for key, method in problem.each_methods():
+                if name is not None and key != name:
+                    continue
+
+                if cache is not None and cache.restore(problem, method):
+                    continue
+
+                job = conf.make_job(method.module_name, method.func_name)
+                job.memory_limit = problem.method_memory_limit(conf)
+                timeout = problem.method_timeout(conf, method)
+                jobs.append(((index, method), job, timeout))
+                planned.append((problem, method, timeout))
+                count += 1
+
+            remaining.append(count)
+
+        stop_at = None
+        if schedule is not None:
+            order = schedule.plan(planned)
+            for i in set(range(len(jobs))).difference(order):
+                (index, method), _, _ = jobs[i]
+                method.skip("budget")
+                remaining[index] -= 1
+
+            jobs = [jobs[i] for i in order]
+            if schedule.budget > 0.0:
+                stop_at = time.perf_counter() + schedule.budget / 1000.0
+
+        racers = collections.defaultdict(list)
+        if conf.race:
+            for tag, _, _ in jobs:
+                racers[tag[0]].append(tag)
+
+        next_index = 0
+        while next_index < len(problems) and remaining[next_index] == 0:
+            yield problems[next_index][1]
+            next_index += 1
+
+        time_start = time.perf_counter()
+        finished = self.run_jobs(jobs, stop_at=stop_at)
+        for (index, method), result, is_timeout, dt, info in finished:
+            problem = problems[index][1]
+            if info.get("skipped"):
+                method.skip("budget")
+                schedule.skipped += 1
+
+            elif info.get("cancelled"):
+                method.cancel(dt, problem.winner)
+
+            else:
+                if not is_timeout:
+                    dt = max(0.0, dt - self.call_overhead)
+
+                method.set_result(result, is_timeout, dt, info)
+                if cache is not None:
+                    cache.store(problem, method)
+
+                others = [m for _, m in racers[index]]
+                if problem.winner is None and _wins_race(problem, method, others):
+                    problem.winner = method
+                    self.cancel(tag for tag in racers[index] if tag[1] is not method)
+
+            remaining[index] -= 1
+            while next_index < len(problems) and remaining[next_index] == 0:
+                yield problems[next_index][1]
+                next_index += 1
+
+        if schedule is not None:
+            schedule.actual_makespan = 1000.0 * (time.perf_counter() - time_start)
+
+
+def _wins_race(
+    problem: ProblemSolver, method: SolutionMethod, racers: list[SolutionMethod]
+) -> bool:
+    """
+    Does a finished method win the race of problem, by the answer, or without
+    it, by the same result as a majority of racers.
+    """
+    if len(racers) < 2 or not method.finished or method.result is None:
+        return False
+
+    if problem.answer is not None:
+        return method.result == problem.answer
+
+    agreed = sum(1 for m in racers if m.finished and m.result == method.result)
+    return agreed > len(racers) // 2
+
+
+class Schedule:
+    """
+    Schedule of methods on workers, longest expected first, so that a slow
+    method does not start last and decide when the run finishes. Time cost of
+    a method is predicted by the median of its recent successful history,
+    or guessed by TIMEOUT_EXT of its problem, or else the median of all
+    predictions.
+
+    With a budget, only methods predicted to fit in it are planned, methods
+    of changed problems first, then methods never run, then the fastest
+    correct method of each problem, then the others, cheaper ones first. They
+    are dispatched in this order, longest expected first within each group,
+    so a run over budget only drops the methods least needed.
+    """
+
+    LIMIT = 10
+    DEFAULT_COST = 100.0
+
+    def __init__(
+        self,
+        workers: int,
+        history: History | None = None,
+        budget: float = 0.0,
+        cache: RunCache | None = None,
+    ):
+        self.workers = max(1, workers)
+        self.history = history
+        self.budget = budget
+        self.cache = cache
+        self.entries = []
+        self.skipped = 0
+        self.predicted_makespan = 0.0
+        self.actual_makespan = None
+
+    def _history(self, pid: int, name: str) -> tuple[float | None, bool]:
+        """
+        Median of recent successful time costs of a method, None if no one,
+        and whether it has ever run.
+        """
+        if self.history is None:
+            return None, False
+
+        rows = self.history.timings(pid, name, limit=self.LIMIT)
+        costs = [
+            r["time_cost"]
+            for r in rows
+            if r["status"] in History.SUCCESS_STATUS and not r["noisy"]
+        ]
+        return statistics.median(costs) if len(costs) > 0 else None, len(rows) > 0
+
+    def _predict(
+        self,
+        methods: list[tuple[ProblemSolver, SolutionMethod, float]],
+        histories: list[tuple[float | None, bool]],
+    ) -> list[tuple[float, str]]:
+        """
+        Predict (time_cost, source) of methods, source is "history" or "guess".
+        """
+        known = [cost for cost, _ in histories if cost is not None]
+        guess = statistics.median(known) if len(known) > 0 else self.DEFAULT_COST
+        predictions = []
+        for (problem, _, timeout), (cost, _) in zip(methods, histories):
+            source = "history"
+            if cost is None:
+                source = "guess"
+                cost = problem.timeout_ext if problem.timeout_ext > 0.0 else guess
+
+            if timeout > 0.0:
+                cost = min(cost, timeout)
+
+            predictions.append((cost, source))
+
+        return predictions
+
+    def partition(
+        self,
+        methods: list[tuple[ProblemSolver, SolutionMethod, float]],
+        count: int,
+        timings: dict[tuple[int, str], float] | None = None,
+    ) -> list[int]:
+        """
+        Partition methods given as (problem, method, timeout) into `count`
+        shards of about the same time cost by `timings`, return the shard of
+        each method. Local history is not read, so runs on all hosts agree on
+        the partition. Methods without timings are predicted as in schedule
+        of a run without history, by extended timeouts of problems.
+        """
+        timings = timings or {}
+        histories = [(timings.get((p.pid, m.name)), False) for p, m, _ in methods]
+
+        predictions = self._predict(methods, histories)
+        order = sorted(
+            range(len(methods)),
+            key=lambda i: (-predictions[i][0], methods[i][0].pid, methods[i][1].name),
+        )
+        loads = [(0.0, shard) for shard in range(count)]
+        result = [0] * len(methods)
+        for i in order:
+            load, shard = heapq.heappop(loads)
+            result[i] = shard
+            heapq.heappush(loads, (load + predictions[i][0], shard))
+
+        return result
+
+    def _makespan(self, costs: Iterable[float]) -> float:
+        """
+        Makespan of methods of `costs` dispatched in order, each idle worker
+        takes the next method as runner does.
+        """
+        finish_times = [0.0] * self.workers
+        for cost in costs:
+            heapq.heapreplace(finish_times, finish_times[0] + cost)
+
+        return max(finish_times)
+
+    def _select(
+        self,
+        methods: list[tuple[ProblemSolver, SolutionMethod, float]],
+        histories: list[tuple[float | None, bool]],
+        costs: list[float],
+    ) -> list[int]:
+        """
+        Select methods fitting the budget by priority, return their indexes in
+        dispatch order, whose simulated makespan is within the budget.
+        """
+        fastest = {}
+        for i, ((problem, _, _), (cost, _)) in enumerate(zip(methods, histories)):
+            best = fastest.get(problem.pid)
+            if cost is not None and (best is None or cost < histories[best][0]):
+                fastest[problem.pid] = i
+
+        def _priority(i: int) -> int:
+            problem = methods[i][0]
+            if self.cache is not None and self.cache.is_changed(problem):
+                return 0
+
+            if not histories[i][1]:
+                return 1
+
+            return 2 if fastest.get(problem.pid) == i else 3
+
+        def _dispatch_key(i: int) -> tuple[int, float]:
+            return _priority(i), -costs[i]
+
+        selected = []
+        for i in sorted(range(len(methods)), key=lambda i: (_priority(i), costs[i])):
+            trial = sorted(selected + [i], key=_dispatch_key)
+            if self._makespan(costs[j] for j in trial) <= self.budget:
+                selected = trial
+
+        return selected
+
+    def plan(
+        self, methods: list[tuple[ProblemSolver, SolutionMethod, float]]
+    ) -> list[int]:
+        """
+        Plan methods given as (problem, method, timeout), return indexes of
+        them in dispatch order. Dispatching is simulated as runner does, each
+        idle worker takes the next method, to predict the makespan. Methods
+        not planned are skipped for budget.
+        """
+        histories = [self._history(p.pid, m.name) for p, m, _ in methods]
+        predictions = self._predict(methods, histories)
+        order = sorted(range(len(methods)), key=lambda i: -predictions[i][0])
+        if self.budget > 0.0:
+            costs = [cost for cost, _ in predictions]
+            order = self._select(methods, histories, costs)
+            self.skipped = len(methods) - len(order)
+
+        finish_times = [(0.0, i) for i in range(self.workers)]
+        self.entries = []
+        for i in order:
+            finish, worker = heapq.heappop(finish_times)
+            cost, source = predictions[i]
+            problem, method, _ = methods[i]
+            self.entries.append((problem, method, cost, source, worker))
+            heapq.heappush(finish_times, (finish + cost, worker))
+
+        self.predicted_makespan = max(finish for finish, _ in finish_times)
+        return order
+
+    def print_plan(self) -> str:
+        """
+        Print planned methods in dispatch order.
+        """
+        order = "longest expected first"
+        if self.budget > 0.0:
+            order = f"by priority, then {order}"
+        lines = [f"Schedule on {self.workers} workers, {order}:"]
+        for problem, method, cost, source, worker in self.entries:
+            label = f"p{problem.pid:04d}.{method.func_name}"
+            lines.append(
+                f"  worker {worker + 1:<3} {label:<30} {cost:10.3f}ms {source}"
+            )
+
+        return "\n".join(lines)
+
+    def print_summary(self) -> str:
+        """
+        Print predicted and actual makespan.
+        """
+        line = f"Makespan on {self.workers} workers: predicted "
+        line += f"{self.predicted_makespan / 1000.0:.3f}s"
+        if self.actual_makespan is not None:
+            line += f", actual {self.actual_makespan / 1000.0:.3f}s"
+
+        if self.budget > 0.0:
+            line += f", budget {self.budget / 1000.0:.3f}s"
+            line += f", {self.skipped} methods skipped"
+
+        return line
+
+
+def _git_revision() -> str:
+    try:
+        rev = subprocess.run(
+            ["git", "rev-parse", "--short=12", "HEAD"],
+            capture_output=True,
+            text=True,
+            timeout=5.0,
+            check=True,
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            capture_output=True,
+            text=True,
+            timeout=5.0,
+            check=True,
+        ).stdout.strip()
+
+    except (OSError, subprocess.SubprocessError):
+        return ""
+
+    return f"{rev}-dirty" if dirty else rev
+
+
+class History:
+    """
+    Timing history of solution methods, stored in a local SQLite database.
+    """
+
+    COLUMNS = [
+        ("run_id", "TEXT"),
+        ("kind", "TEXT"),
+        ("started", "TEXT"),
+        ("problem", "INTEGER"),
+        ("method", "TEXT"),
+        ("result", "TEXT"),
+        ("status", "TEXT"),
+        ("time_cost", "REAL"),
+        ("python", "TEXT"),
+        ("host", "TEXT"),
+        ("revision", "TEXT"),
+        ("cpu_user", "REAL"),
+        ("cpu_sys", "REAL"),
+        ("maxrss", "INTEGER"),
+        ("maxrss_delta", "INTEGER"),
+        ("majflt", "INTEGER"),
+        ("minflt", "INTEGER"),
+        ("nvcsw", "INTEGER"),
+        ("nivcsw", "INTEGER"),
+        ("gc_gen0", "INTEGER"),
+        ("gc_gen1", "INTEGER"),
+        ("gc_gen2", "INTEGER"),
+        ("gc_time", "REAL"),
+        ("noisy", "TEXT"),
+    ]
+
+    RUSAGE_COLUMNS = (
+        "cpu_user",
+        "cpu_sys",
+        "maxrss",
+        "maxrss_delta",
+        "majflt",
+        "minflt",
+        "nvcsw",
+        "nivcsw",
+    )
+
+    SUCCESS_STATUS = ("correct", "done")
+
+    def __init__(self, path: str = HISTORY_FILE, kind: str = "run"):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.kind = kind
+        self.started = datetime.now().isoformat(timespec="seconds")
+        self.run_id = f"{self.started}/{os.getpid()}"
+        self.environment = {
+            "python": f"{platform.python_implementation()} {platform.python_version()}",
+            "host": platform.node(),
+            "revision": None,
+        }
+        self._create()
+
+    def _create(self) -> None:
+        self.db.execute("CREATE TABLE IF NOT EXISTS runs (id INTEGER PRIMARY KEY)")
+        existing = {row[1] for row in self.db.execute("PRAGMA table_info(runs)")}
+        for name, column_type in self.COLUMNS:
+            if name not in existing:
+                self.db.execute(f"ALTER TABLE runs ADD COLUMN {name} {column_type}")
+
+        self.db.execute(
+            "CREATE INDEX IF NOT EXISTS runs_method ON runs (problem, method, kind)"
+        )
+        self.db.commit()
+
+    def close(self) -> None:
+        """
+        Commit records and close the database.
+        """
+        if self.db is not None:
+            self.db.commit()
+            self.db.close()
+            self.db = None
+
+    def _record_values(self, problem: ProblemSolver, method: SolutionMethod) -> dict:
+        if self.environment["revision"] is None:
+            self.environment["revision"] = _git_revision()
+
+        usage = method.info.get("rusage", {})
+        collector = method.info.get("gc", {})
+        collections = collector.get("collections", [None] * 3)
+        return {
+            **{name: usage.get(name) for name in self.RUSAGE_COLUMNS},
+            **{f"gc_gen{i}": n for i, n in enumerate(collections[:3])},
+            "gc_time": collector.get("time"),
+            "run_id": self.run_id,
+            "kind": self.kind,
+            "started": self.started,
+            "problem": problem.pid,
+            "method": method.name,
+            "result": f"{method.result}" if method.result is not None else None,
+            "status": method.status(problem.answer),
+            "time_cost": method.time_cost,
+            "noisy": ", ".join(method.noise) or None,
+            **self.environment,
+        }
+
+    def record(self, problem: ProblemSolver) -> None:
+        """
+        Record all run methods of a problem.
+        """
+        for _, method in problem.each_methods():
+            if not method.is_run() or method.cached:
+                continue
+
+            values = self._record_values(problem, method)
+            names = ", ".join(values)
+            marks = ", ".join(f":{name}" for name in values)
+            self.db.execute(f"INSERT INTO runs ({names}) VALUES ({marks})", values)
+
+    def methods(self, pids: Iterable[int] = None) -> list[tuple[int, str]]:
+        """
+        Get (problem, method) with history, in order.
+        """
+        rows = self.db.execute(
+            "SELECT DISTINCT problem, method FROM runs WHERE kind = ? "
+            + "ORDER BY problem, method",
+            (self.kind,),
+        ).fetchall()
+        if pids is not None:
+            pids = set(pids)
+            rows = [row for row in rows if row[0] in pids]
+
+        return rows
+
+    def timings(self, pid: int, method: str, limit: int = 0) -> list[sqlite3.Row]:
+        """
+        Get latest runs of a method, in chronological order.
+        """
+        self.db.row_factory = sqlite3.Row
+        sql = "SELECT * FROM runs WHERE problem = ? AND method = ? AND kind = ? "
+        sql += "ORDER BY id DESC"
+        params = [pid, method, self.kind]
+        if limit > 0:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        rows = self.db.execute(sql, params).fetchall()
+        self.db.row_factory = None
+        return rows[::-1]
+
+
+def _open_history(kind: str) -> History | None:
+    try:
+        return History(kind=kind)
+
+    except (OSError, sqlite3.Error) as ex:
+        print(f"Failed to open timing history: {ex}")
+        return None
+
+
+def detect_regression(
+    costs: list[float], window: int, threshold: float, min_delta: float
+) -> tuple[float, float, bool] | None:
+    """
+    Compare the latest time cost with the median of previous `window` ones,
+    return (latest, baseline, is_regression), or None if not enough history.
+    """
+    if len(costs) < 2:
+        return None
+
+    latest = costs[-1]
+    baseline = statistics.median(costs[-window - 1 : -1])
+    is_regression = (
+        latest > baseline * (1.0 + threshold) and latest - baseline > min_delta
+    )
+    return latest, baseline, is_regression
+
+
+class AdaptiveTimeout:
+    """
+    Timeout of methods adapted to their history, a multiple of a high
+    percentile of previous successful time costs, clamped by a floor and a
+    ceiling. Methods with too little history keep the static timeout.
+    """
+
+    PERCENTILE = 95
+    MIN_SAMPLES = 3
+    LIMIT = 20
+
+    def __init__(
+        self,
+        history: History,
+        multiple: float = 3.0,
+        floor: float = 1000.0,
+        ceiling: float = 60000.0,
+    ):
+        self.history = history
+        self.multiple = multiple
+        self.floor = floor
+        self.ceiling = ceiling
+
+    def deadline(self, pid: int, name: str) -> float | None:
+        """
+        Adaptive timeout of a method in milliseconds, None if not enough
+        history.
+        """
+        rows = self.history.timings(pid, name, limit=self.LIMIT)
+        costs = [
+            r["time_cost"]
+            for r in rows
+            if r["status"] in History.SUCCESS_STATUS and not r["noisy"]
+        ]
+        if len(costs) < self.MIN_SAMPLES:
+            return None
+
+        high = statistics.quantiles(costs, n=100, method="inclusive")[
+            self.PERCENTILE - 1
+        ]
+        return min(max(self.multiple * high, self.floor), self.ceiling)
+
+    def apply(
+        self, problems: Iterable[tuple[ProblemId | None, ProblemSolver]]
+    ) -> Iterator[tuple[ProblemId | None, ProblemSolver]]:
+        """
+        Set adaptive deadline of all methods of problems.
+        """
+        for pid, problem in problems:
+            for name, method in problem.each_methods():
+                method.deadline = self.deadline(problem.pid, name)
+
+            yield pid, problem
+
+
+def _sparkline(values: list[float]) -> str:
+    ticks = "▁▂▃▄▅▆▇█"
+    encoding = (getattr(sys.stdout, "encoding", None) or "").lower()
+    if "utf" not in encoding:
+        ticks = "_.-=+*#@"
+
+    if len(values) == 0:
+        return ""
+
+    low, high = min(values), max(values)
+    if high - low <= 0.0:
+        return ticks[0] * len(values)
+
+    scale = (len(ticks) - 1) / (high - low)
+    return "".join(ticks[int((v - low) * scale)] for v in values)
+
+
+def _module_files(module_name: str, package_dir: str = "") -> list[str]:
+    """
+    Find source files of a module in current directory, empty if the module
+    is not a local one.
+    """
+    base = os.path.join(package_dir, *module_name.split("."))
+    for filepath in (f"{base}.py", os.path.join(base, "__init__.py")):
+        if os.path.isfile(filepath):
+            return [os.path.normpath(filepath)]
+
+    return []
+
+
+def _local_imports(filepath: str) -> list[str]:
+    """
+    Find source files of local modules imported by a source file.
+    """
+    try:
+        with open(filepath, "rb") as f:
+            tree = ast.parse(f.read(), filename=filepath)
+
+    except (OSError, SyntaxError):
+        return []
+
+    result = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                result += _module_files(alias.name)
+
+        elif isinstance(node, ast.ImportFrom):
+            package_dir = ""
+            if node.level > 0:
+                package_dir = os.path.dirname(filepath)
+                for _ in range(node.level - 1):
+                    package_dir = os.path.dirname(package_dir)
+
+            module = node.module or ""
+            if module:
+                result += _module_files(module, package_dir)
+
+            for alias in node.names:
+                name = f"{module}.{alias.name}" if module else alias.name
+                result += _module_files(name, package_dir)
+
+    return result
+
+
+class RunCache:
+    """
+    Content-addressed cache of successful method results, keyed on hashes of
+    the problem source, local modules it imports, its data loader and data
+    files, so any change of them invalidates the entry.
+    """
+
+    VERSION = 1
+
+    entries: dict[str, dict]
+
+    def __init__(
+        self, path: str = RUN_CACHE_FILE, preload: bool = True, reuse: bool = True
+    ):
+        self.path = path
+        self.preload = preload
+        self.reuse = reuse
+        self.entries = {}
+        self.dirty = False
+        self._file_hashes = {}
+        self._keys = {}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                content = json.load(f)
+
+            if content.get("version") == self.VERSION:
+                self.entries = content.get("entries", {})
+
+        except (OSError, ValueError):
+            pass
+
+    def save(self) -> None:
+        """
+        Save cache to disk if changed.
+        """
+        if not self.dirty:
+            return
+
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": self.VERSION, "entries": self.entries}, f)
+
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+    def _hash_file(self, filepath: str) -> str:
+        if filepath not in self._file_hashes:
+            digest = hashlib.sha256()
+            try:
+                with open(filepath, "rb") as f:
+                    digest.update(f.read())
+
+            except OSError:
+                digest.update(b"\0missing")
+
+            self._file_hashes[filepath] = digest.hexdigest()
+
+        return self._file_hashes[filepath]
+
+    @staticmethod
+    def input_files(module_name: str) -> list[str]:
+        """
+        Files which affect result of a problem module: its source, local
+        modules imported recursively, data loader and data files.
+        """
+        base_name = module_name.rsplit(".", 1)[-1]
+        sources = _module_files(module_name)
+        sources += _module_files(f"data.{base_name}")
+        files = set()
+        while len(sources) > 0:
+            filepath = sources.pop()
+            if filepath in files:
+                continue
+
+            files.add(filepath)
+            sources += _local_imports(filepath)
+
+        files.update(glob.glob(os.path.join(DATA_DIR, f"{base_name}.*")))
+        return sorted(os.path.normpath(f) for f in files)
+
+    def key(self, module_name: str) -> str:
+        """
+        Content hash of all inputs of a problem module.
+        """
+        if module_name not in self._keys:
+            digest = hashlib.sha256()
+            python = f"{platform.python_implementation()} {platform.python_version()}"
+            digest.update(f"{self.VERSION}\0{python}\0{self.preload}\0".encode())
+            for filepath in self.input_files(module_name):
+                digest.update(f"{filepath}\0{self._hash_file(filepath)}\0".encode())
+
+            self._keys[module_name] = digest.hexdigest()
+
+        return self._keys[module_name]
+
+    @staticmethod
+    def _entry_name(method: SolutionMethod) -> str:
+        return f"{method.module_name}:{method.func_name}"
+
+    def restore(self, problem: ProblemSolver, method: SolutionMethod) -> bool:
+        """
+        Restore result of a method from cache, return False if not cached, or
+        results are not reused.
+        """
+        if not self.reuse:
+            return False
+
+        entry = self.entries.get(self._entry_name(method))
+        if entry is None or entry["key"] != self.key(problem.module_name):
+            return False
+
+        method.set_cached(entry["result"], entry["time_cost"])
+        return True
+
+    def is_changed(self, problem: ProblemSolver) -> bool:
+        """
+        Has any input of a problem changed since its methods were cached.
+        """
+        key = self.key(problem.module_name)
+        prefix = f"{problem.module_name}:"
+        return any(
+            entry["key"] != key
+            for name, entry in self.entries.items()
+            if name.startswith(prefix)
+        )
+
+    def store(self, problem: ProblemSolver, method: SolutionMethod) -> None:
+        """
+        Store result of a method if it is successful.
+        """
+        if method.cached or method.status(problem.answer) not in ("correct", "done"):
+            return
+
+        try:
+            json.dumps(method.result)
+
+        except (TypeError, ValueError):
+            return
+
+        self.entries[self._entry_name(method)] = {
+            "key": self.key(problem.module_name),
+            "result": method.result,
+            "time_cost": method.time_cost,
+        }
+        self.dirty = True
+
+
+def _natural_filename(filename: str) -> Iterable[str | int]:
+    parts = []
+    i = 0
+    buf, flag = [], "char"
+    while i < len(filename):
+        c = filename[i]
+        cf = "digit" if c.isdigit() else "char"
+        if cf != flag:
+            n = "".join(buf)
+            if flag == "digit":
+                n = int(n)
+
+            parts.append(n)
+            flag = cf
+            buf = []
+
+        buf.append(c)
+        i += 1
+
+    if len(buf) > 0:
+        n = "".join(buf)
+        if flag == "digit":
+            n = int(n)
+
+        parts.append(n)
+
+    return parts
+
+
+def _problem_id(base_name: str) -> int:
+    try:
+        return int(base_name[1:])
+
+    except ValueError as ex:
+        raise ValueError(
+            f"Invalid problem name: '{base_name}', "
+            + "should be pXXXX which XXXX is a number"
+        ) from ex
+
+
+def describe_problem(module_name: str) -> dict:
+    """
+    Import a problem module and describe it with picklable values, this is
+    called in worker process, so that runner process never imports problems.
+    """
+    mod = importlib.import_module(f"{module_name}")
+    data_name = f"data.{module_name.rsplit('.', 1)[-1]}"
+    info = {
+        "doc": mod.__doc__,
+        "answer": getattr(mod, "ANSWER", None),
+        "timeout_ext": getattr(mod, "TIMEOUT_EXT", 0.0),
+        "memory_limit": getattr(mod, "MEMORY_LIMIT", 0),
+        "methods": [],
+        "extra_data": data_name if check_extra_data(data_name) else "",
+    }
+
+    for name, func in inspect.getmembers(mod, inspect.isfunction):
+        # inspect.getmembers() returns all members sorted by name
+        if name == "solve" or (len(name) > 6 and name.startswith("solve_")):
+            info["methods"].append((name, func.__doc__))
+
+    return info
+
+
+def check_extra_data(module_name: str) -> bool:
+    """
+    Check if there is extra data for a problem.
+    """
+    try:
+        mod = importlib.import_module(f"{module_name}")
+        if not hasattr(mod, "load"):
+            return False
+
+        return True
+
+    except ImportError:
+        return False
+
+
+def _literal_value(node: ast.expr) -> tuple[bool, object]:
+    try:
+        value = ast.literal_eval(node)
+        json.dumps(value)
+        return True, value
+
+    except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+        return False, None
+
+
+def _top_level_names(tree: ast.Module) -> Iterator[tuple[str, ast.AST]]:
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            yield node.name, node
+
+        elif isinstance(node, ast.Assign):
+            for target in node.targets:
+                if isinstance(target, ast.Name):
+                    yield target.id, node
+
+        elif isinstance(node, ast.AnnAssign) and isinstance(node.target, ast.Name):
+            yield node.target.id, node
+
+
+# module level constants of problems, and their keys in description
+CONSTANT_KEYS = {
+    "ANSWER": "answer",
+    "TIMEOUT_EXT": "timeout_ext",
+    "MEMORY_LIMIT": "memory_limit",
+}
+
+
+def parse_problem_file(filepath: str, data_filepath: str) -> dict:
+    """
+    Describe a problem by parsing its source, the same as describe_problem()
+    but without importing it. The description is marked as dynamic if ANSWER,
+    TIMEOUT_EXT or MEMORY_LIMIT is not a literal, which needs
+    describe_problem() instead.
+    """
+    module_name = os.path.splitext(filepath)[0].replace(os.sep, ".")
+    try:
+        with open(filepath, "rb") as f:
+            tree = ast.parse(f.read(), filename=filepath)
+
+    except SyntaxError as ex:
+        return {"error": "syntax", "message": str(ex)}
+
+    info = {
+        "doc": ast.get_docstring(tree, clean=False),
+        "answer": None,
+        "timeout_ext": 0.0,
+        "memory_limit": 0,
+        "methods": [],
+        "extra_data": "",
+        "dynamic": False,
+    }
+
+    methods = {}
+    for name, node in _top_level_names(tree):
+        if name in CONSTANT_KEYS and not isinstance(node, ast.FunctionDef):
+            if node.value is None:
+                continue
+
+            is_literal, value = _literal_value(node.value)
+            info["dynamic"] = info["dynamic"] or not is_literal
+            info[CONSTANT_KEYS[name]] = value
+
+        elif name == "solve" or (len(name) > 6 and name.startswith("solve_")):
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                methods[name] = ast.get_docstring(node, clean=False)
+            else:
+                info["dynamic"] = True
+
+    # the same order as inspect.getmembers(), sorted by name
+    info["methods"] = sorted(methods.items())
+
+    if os.path.exists(data_filepath):
+        try:
+            with open(data_filepath, "rb") as f:
+                data_tree = ast.parse(f.read(), filename=data_filepath)
+
+            if any(name == "load" for name, _ in _top_level_names(data_tree)):
+                info["extra_data"] = f"data.{module_name.rsplit('.', 1)[-1]}"
+
+        except SyntaxError:
+            pass
+
+    return info
+
+
+def _parse_problem_file_args(args: tuple[str, str]) -> dict:
+    return parse_problem_file(*args)
+
+
+class ProblemIndex:
+    """
+    Metadata index of problems, parsed from source without importing, and
+    cached on disk. Each entry is invalidated by mtime and size of the
+    problem file and its data loader.
+    """
+
+    VERSION = 2
+    PARALLEL_THRESHOLD = 16
+
+    entries: dict[str, dict]
+
+    def __init__(self, dirname: str = PROBLEM_DIR, path: str = INDEX_FILE):
+        self.dirname = dirname
+        self.path = path
+        self.entries = {}
+        self.dirty = False
+        self.load()
+
+    def load(self) -> None:
+        """
+        Load index from disk, an invalid index file is ignored.
+        """
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                content = json.load(f)
+
+        except (OSError, ValueError):
+            return
+
+        if content.get("version") == self.VERSION:
+            self.entries = content.get("entries", {})
+
+    def save(self) -> None:
+        """
+        Save index to disk if changed.
+        """
+        if not self.dirty:
+            return
+
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": self.VERSION, "entries": self.entries}, f)
+
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+    def _paths(self, filename: str) -> tuple[str, str]:
+        filepath = os.path.join(self.dirname, filename)
+        data_filepath = os.path.join(DATA_DIR, filename)
+        return filepath, data_filepath
+
+    @staticmethod
+    def _stat(filepath: str) -> list[int] | None:
+        try:
+            st = os.stat(filepath)
+            return [st.st_mtime_ns, st.st_size]
+
+        except OSError:
+            return None
+
+    def update(self, filenames: Iterable[str], prune: bool = False) -> None:
+        """
+        Update entries of given problem files, parse stale files in parallel.
+        """
+        filenames = list(filenames)
+        stale = []
+        for filename in filenames:
+            filepath, data_filepath = self._paths(filename)
+            key = [self._stat(filepath), self._stat(data_filepath)]
+            entry = self.entries.get(filename)
+            if entry is None or entry["key"] != key:
+                stale.append((filename, key))
+
+        if len(stale) >= self.PARALLEL_THRESHOLD:
+            processes = min(usable_cpu_count(), len(stale))
+            with multiprocessing.Pool(processes=processes) as pool:
+                args = [self._paths(filename) for filename, _ in stale]
+                infos = pool.map(_parse_problem_file_args, args)
+        else:
+            infos = [parse_problem_file(*self._paths(name)) for name, _ in stale]
+
+        for (filename, key), info in zip(stale, infos):
+            self.entries[filename] = {"key": key, "info": info}
+            self.dirty = True
+
+        if prune:
+            for filename in set(self.entries) - set(filenames):
+                del self.entries[filename]
+                self.dirty = True
+
+        self.save()
+
+    def get(self, filename: str) -> dict | None:
+        """
+        Get description of a problem file.
+        """
+        entry = self.entries.get(filename)
+        if entry is None:
+            return None
+
+        return entry["info"]
+
+
+def _select_problem_files(
+    dirname: str, id_list: Iterable[ProblemId] = None
+) -> tuple[list[tuple[str, str, int]], dict[int, ProblemId], bool]:
+    """
+    Select problem files in natural order, return list of (module_name,
+    filename, pid), map of selected problem ID, and whether all files are
+    selected.
+    """
+    id_map = {pid.pid: pid for pid in (id_list or [])}
+    if id_list is not None and len(id_list) > 0:
+        file_list = [f"{pid.problem_name()}.py" for pid in id_list]
+        is_all = False
+    else:
+        file_list = os.listdir(dirname)
+        is_all = True
+
+    file_natural_list = [
+        (filename, _natural_filename(filename)) for filename in file_list
+    ]
+    file_natural_list.sort(key=lambda x: x[1])
+    found = []
+    for filename, _ in file_natural_list:
+        if not filename.endswith(".py"):
+            continue
+
+        base_name = filename[0:-3]
+        if base_name == "__init__":
+            continue
+
+        pid = _problem_id(base_name)
+        if len(id_map) > 0 and pid not in id_map:
+            continue
+
+        package_name = dirname.replace("/", ".")
+        found.append((f"{package_name}.{base_name}", filename, pid))
+
+    return found, id_map, is_all
+
+
+def _open_index(
+    dirname: str, found: list[tuple[str, str, int]], is_all: bool
+) -> ProblemIndex:
+    index = ProblemIndex(dirname)
+    filenames = [filename for _, filename, _ in found]
+    if not is_all:
+        filenames = [
+            name for name in filenames if os.path.exists(os.path.join(dirname, name))
+        ]
+
+    try:
+        index.update(filenames, prune=is_all)
+
+    except OSError as ex:
+        print(f"Failed to update problem index: {ex}")
+
+    return index
+
+
+def find_problem_solvers(
+    dirname: str,
+    id_list: Iterable[ProblemId] = None,
+    runner: Runner | None = None,
+    timeout: float = 0.0,
+    use_index: bool = True,
+) -> Iterator[tuple[ProblemId | None, ProblemSolver]]:
+    """
+    Find all problem solvers in given directory. Problems are described by
+    the metadata index, or imported by workers of runner if the index can not
+    describe them, or imported by current process if no runner given.
+    """
+    found, id_map, is_all = _select_problem_files(dirname, id_list)
+
+    infos = {}
+    if use_index:
+        index = _open_index(dirname, found, is_all)
+        for module_name, filename, _ in found:
+            info = index.get(filename)
+            if info is not None and not info.get("dynamic"):
+                infos[module_name] = info
+
+    module_names = [name for name, _, _ in found if name not in infos]
+    if runner is not None:
+        described = runner.describe_problems(module_names, timeout=timeout)
+    else:
+        described = ((name, _describe_or_error(name)) for name in module_names)
+
+    for module_name, filename, pid in found:
+        if module_name in infos:
+            info = infos[module_name]
+        else:
+            _, info = next(described)
+
+        if info is None:
+            print(f"Failed to import {module_name}: timeout")
+
+        elif isinstance(info, ImportError):
+            print(f"Failed to import {module_name}: {info}")
+
+        elif isinstance(info, SyntaxError):
+            print(f"Syntax error in {module_name}/{filename}: {info}")
+
+        elif "error" in info:
+            print(f"Syntax error in {module_name}/{filename}: {info['message']}")
+
+        else:
+            solver = ProblemSolver(pid, module_name)
+            solver.set_description(info)
+            yield id_map.get(pid), solver
+
+
+def _describe_or_error(module_name: str) -> dict | Exception:
+    try:
+        return describe_problem(module_name)
+
+    except (ImportError, SyntaxError) as ex:
+        return ex
+
+
+def do_list(id_list: Iterable[ProblemId], full: bool):
+    """
+    List problems.
+    """
+    for _, problem in find_problem_solvers(PROBLEM_DIR, id_list=id_list):
+        print(f"{problem.pid:<5d} {problem.title}")
+        if full:
+            print(_add_indent(problem.content, "      "))
+            print()
+
+
+def do_create(id_list: Iterable[int]):
+    """
+    Create solution of a problem.
+    """
+    for pid in id_list:
+        filename = f"p{pid:04d}.py"
+        filepath = os.path.join(PROBLEM_DIR, filename)
+        if os.path.exists(filepath):
+            print(f"File {filepath} already exists")
+            continue
+
+        with open(filepath, "w", encoding="utf-8") as f:
+            f.write(
+                "#!/usr/bin/env python3\n"
+                "# coding: utf-8\n"
+                "\n"
+                "\n"
+                '"""\n'
+                "Problem title\n"
+                "\n"
+                "Problem description\n"
+                '"""\n'
+                "\n"
+                "\n"
+                "ANSWER = None\n"
+                "\n"
+                "\n"
+                "def solve() -> int:\n"
+                "    return 0\n"
+            )
+
+
+def _select_shard(
+    problems: Iterable[tuple[ProblemId | None, ProblemSolver]],
+    conf: RunConfigure,
+    schedule: Schedule,
+) -> tuple[list[tuple[ProblemId | None, ProblemSolver]], list[tuple[int, str]]]:
+    """
+    Keep problems and methods of the shard of this run, return them with
+    (problem, method) of all shards.
+    """
+    problems = list(problems)
+    methods = []
+    for pid, problem in problems:
+        name = pid.method if pid is not None else None
+        for key, method in problem.each_methods():
+            if name is None or key == name:
+                # timeouts may be adaptive to history of this host
+                methods.append((problem, method, 0.0))
+
+    index, count = conf.shard
+    kept = collections.defaultdict(list)
+    shards = schedule.partition(methods, count, conf.timings)
+    for (problem, method, _), shard in zip(methods, shards):
+        if shard == index - 1:
+            kept[problem.pid].append(method.name)
+
+    result = []
+    for pid, problem in problems:
+        if problem.pid in kept:
+            problem.retain_methods(kept[problem.pid])
+            result.append((pid, problem))
+
+    return result, [(problem.pid, method.name) for problem, method, _ in methods]
+
+
+def _json_result(value: object) -> object:
+    try:
+        json.dumps(value)
+        return value
+
+    except (TypeError, ValueError):
+        return f"{value}"
+
+
+def _problem_to_json(problem: ProblemSolver) -> dict:
+    methods = []
+    for _, method in problem.each_methods():
+        methods.append(
+            {
+                "name": method.name,
+                "func_name": method.func_name,
+                "note": method.note,
+                "status": method.status(problem.answer),
+                "result": _json_result(method.result) if method.is_run() else None,
+                "time_cost": method.time_cost,
+                "oom": method.oom,
+                "error": method.error,
+                "skipped": method.skipped,
+                "cancelled": method.cancelled,
+                "rusage": method.info.get("rusage"),
+                "gc": method.info.get("gc"),
+                "noise": method.noise,
+            }
+        )
+
+    return {
+        "pid": problem.pid,
+        "module_name": problem.module_name,
+        "title": problem.title,
+        "answer": _json_result(problem.answer),
+        "timeout_ext": problem.timeout_ext,
+        "methods": methods,
+    }
+
+
+def _problem_from_json(entry: dict) -> ProblemSolver:
+    problem = ProblemSolver(entry["pid"], entry["module_name"])
+    problem.title = entry["title"]
+    problem.answer = entry["answer"]
+    problem.timeout_ext = entry["timeout_ext"]
+    _merge_methods(problem, entry)
+    return problem
+
+
+def _merge_methods(problem: ProblemSolver, entry: dict) -> None:
+    for item in entry["methods"]:
+        if item["name"] in problem.methods:
+            continue
+
+        problem.add_method(item["func_name"], item["name"], item["note"])
+        method = problem.methods[item["name"]]
+        if item["skipped"] is not None:
+            method.skip(item["skipped"])
+
+        elif item["cancelled"] is not None:
+            method.cancelled = tuple(item["cancelled"])
+
+        elif item["status"] == "timeout":
+            method.set_result(_TimeoutResult(), True, item["time_cost"])
+
+        elif item["status"] != "not run":
+            info = {
+                "oom": item["oom"],
+                "error": item.get("error"),
+                "rusage": item.get("rusage"),
+                "gc": item.get("gc"),
+            }
+            info = {key: value for key, value in info.items() if value is not None}
+            method.set_result(item["result"], False, item["time_cost"], info)
+
+        # host conditions are not kept, only their assessment
+        method.noise = item.get("noise") or []
+
+
+def _write_json(
+    path: str,
+    problems: list[ProblemSolver],
+    conf: RunConfigure,
+    partitioned: list[tuple[int, str]] | None = None,
+) -> None:
+    content = {
+        "shard": list(conf.shard) if conf.shard is not None else None,
+        "partitioned": partitioned,
+        "problems": [_problem_to_json(problem) for problem in problems],
+    }
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(content, f, indent=1)
+
+
+def _start_runner(conf: RunConfigure, monitor: HostMonitor) -> Runner:
+    """
+    Start runner of local worker processes, or connected to worker agents.
+    """
+    if conf.workers and not conf.authkey:
+        print(f"Worker agents require --authkey or ${AUTHKEY_ENV}")
+        sys.exit(1)
+
+    runner = Runner(
+        jobs=conf.jobs,
+        backend=conf.backend,
+        pin=conf.pin,
+        nice=conf.nice,
+        monitor=monitor,
+        remote=conf.workers,
+        authkey=conf.authkey.encode() if conf.workers else None,
+    )
+    try:
+        runner.reset_pool()
+
+    except (OSError, EOFError, multiprocessing.AuthenticationError) as ex:
+        runner.close()
+        print(f"Failed to connect to worker agents: {ex}")
+        sys.exit(1)
+
+    conf.jobs = runner.jobs
+    return runner
+
+
+def _calibrate(runner: Runner, conf: RunConfigure) -> None:
+    """
+    Calibrate overhead of runner, and report it with noise control settings.
+    Benchmark samples are timed in loops, so no overhead is subtracted there.
+    """
+    calibration = runner.calibrate()
+    if not conf.is_noise_controlled() or len(calibration) == 0:
+        return
+
+    settings = []
+    if conf.pin:
+        settings.append(f"pinned to CPU {','.join(f'{cpu}' for cpu in conf.pin)}")
+
+    if conf.nice != 0:
+        settings.append(f"nice {conf.nice}")
+
+    print(
+        f"Workers {', '.join(settings)}: timer {calibration['timer_ns']}ns, "
+        + f"call {calibration['call_ns']:.0f}ns"
+        + ("" if isinstance(conf, BenchConfigure) else " (subtracted)")
+        + ", "
+        + f"dispatch {calibration['dispatch_ms']:.3f}ms"
+    )
+
+
+def _report_host(monitor: HostMonitor, is_tty: bool) -> None:
+    """
+    Report noisy host conditions sampled since monitor started, if sampled
+    already, when starting workers was not quicker than the interval.
+    """
+    reasons = HostMonitor.assess(monitor.initial or {})
+    if len(reasons) > 0:
+        print(ClrOut.yellow(f"Host is noisy before run: {', '.join(reasons)}", is_tty))
+
+
+class MethodResult:
+    """
+    Result of a solution method in a run, time costs are in milliseconds.
+    """
+
+    name: str
+    func_name: str
+    title: str
+    status: str
+    result: object
+    time_cost: float
+    cached: bool
+    skipped: str | None
+    cancelled: str | None
+    deadline: float | None
+    rusage: dict | None
+    gc: dict | None
+    oom: dict | None
+    error: str | None
+    noise: list[str]
+
+    def __init__(self, method: SolutionMethod, answer: object = None):
+        self.name = method.name
+        self.func_name = method.func_name
+        self.title = method.title
+        self.status = method.status(answer)
+        self.result = method.result if method.is_run() else None
+        self.time_cost = method.time_cost
+        self.cached = method.cached
+        self.skipped = method.skipped
+        self.cancelled = None
+        self.deadline = method.deadline
+        self.rusage = method.info.get("rusage")
+        self.gc = method.info.get("gc")
+        self.oom = method.oom
+        self.error = method.error
+        self.noise = list(method.noise)
+        if method.skipped is not None:
+            self.status = "skipped"
+
+        elif method.cancelled is not None:
+            self.status = "cancelled"
+            self.time_cost, self.cancelled = method.cancelled
+
+    def __repr__(self) -> str:
+        return f"MethodResult({self.func_name}, {self.status}, {self.time_cost:.3f}ms)"
+
+
+class ProblemResult:
+    """
+    Result of a problem in a run. The solver has all details of the run, and
+    is printed by the command line.
+    """
+
+    pid: int
+    module_name: str
+    title: str
+    answer: object
+    correct: bool
+    skipped: bool
+    best: str | None
+    time_cost: float
+    methods: list[MethodResult]
+    solver: ProblemSolver
+
+    def __init__(self, problem: ProblemSolver, strict: bool = False):
+        self.pid = problem.pid
+        self.module_name = problem.module_name
+        self.title = problem.title
+        self.answer = problem.answer
+        self.correct = problem.is_correct(strict=strict)
+        self.skipped = problem.is_skipped()
+        self.best = problem.find_best_solution(check=True)
+        self.methods = [
+            MethodResult(method, problem.answer) for _, method in problem.each_methods()
+        ]
+        self.time_cost = sum(m.time_cost for m in self.methods)
+        self.solver = problem
+
+    def __repr__(self) -> str:
+        status = "skipped" if self.skipped else "correct" if self.correct else "wrong"
+        return f"ProblemResult({self.pid}, {status}, {self.time_cost:.3f}ms)"
+
+
+class ProblemRun:
+    """
+    Run of problems on workers of a runner, iterate it for results as
+    problems are solved. History and run cache are used as configured, and
+    closed when the iteration ends. One run at a time on a runner.
+    """
+
+    schedule: Schedule | None
+    partitioned: list[tuple[int, str]] | None
+
+    def __init__(self, conf: RunConfigure, runner: Runner):
+        self.conf = conf
+        self.runner = runner
+        self.schedule = None
+        # (problem, method) of all shards of a sharded run
+        self.partitioned = None
+        # runs timed on other hosts are not recorded
+        self.record = conf.history and not conf.is_instrumented()
+        self.record = self.record and not conf.workers
+
+    def __iter__(self) -> Iterator[ProblemResult]:
+        conf = self.conf
+        history = None
+        cache = None
+        if self.record or conf.adaptive_timeout:
+            history = _open_history("run")
+
+        if not conf.is_instrumented() and (conf.incremental or conf.budget > 0.0):
+            # budget mode keeps the cache up to date to find changed problems
+            cache = RunCache(preload=conf.preload, reuse=conf.incremental)
+
+        try:
+            problems = find_problem_solvers(
+                PROBLEM_DIR,
+                id_list=conf.id_list,
+                runner=self.runner,
+                timeout=conf.timeout,
+            )
+            if conf.adaptive_timeout and history is not None:
+                adaptive = AdaptiveTimeout(
+                    history,
+                    multiple=conf.timeout_multiple,
+                    floor=conf.timeout_floor,
+                    ceiling=conf.timeout_ceiling,
+                )
+                problems = adaptive.apply(problems)
+
+            if conf.shard is not None:
+                problems, self.partitioned = _select_shard(
+                    problems, conf, Schedule(conf.jobs)
+                )
+
+            # racing methods of a problem are dispatched together
+            if not conf.race:
+                self.schedule = Schedule(
+                    conf.jobs, history, budget=conf.budget, cache=cache
+                )
+
+            for problem in self.runner.solve_problems(
+                problems, conf, cache=cache, schedule=self.schedule
+            ):
+                if self.record and history is not None:
+                    history.record(problem)
+
+                yield ProblemResult(problem, strict=conf.strict)
+
+        finally:
+            if history is not None:
+                history.close()
+
+            if cache is not None:
+                cache.save()
+
+
+# runners shared by calls of run_problems() by worker settings
+_SHARED_RUNNERS = {}
+
+
+def _shared_runner(conf: RunConfigure) -> Runner:
+    key = _pool_shape(conf)
+    if key not in _SHARED_RUNNERS:
+        runner = Runner(
+            jobs=conf.jobs,
+            backend=conf.backend,
+            pin=conf.pin,
+            nice=conf.nice,
+            remote=conf.workers,
+            authkey=conf.authkey.encode() if conf.workers else None,
+        )
+        runner.reset_pool()
+        runner.calibrate()
+        if len(_SHARED_RUNNERS) == 0:
+            atexit.register(_close_shared_runners)
+
+        _SHARED_RUNNERS[key] = runner
+
+    return _SHARED_RUNNERS[key]
+
+
+def _close_shared_runners() -> None:
+    for runner in _SHARED_RUNNERS.values():
+        runner.close()
+
+    _SHARED_RUNNERS.clear()
+
+
+def _id_list(ids: Iterable[int | str | ProblemId]) -> list[ProblemId]:
+    return [i if isinstance(i, ProblemId) else ProblemId(i) for i in ids]
+
+
+def _run_locked(conf: RunConfigure, runner: Runner) -> Iterator[ProblemResult]:
+    """
+    Run problems on runner, whose lock is held and released when done.
+    """
+    try:
+        yield from ProblemRun(conf, runner)
+
+    finally:
+        # jobs still running if the caller stops early
+        runner.abort()
+        runner.lock.release()
+
+
+def run_problems(
+    ids: Iterable[int | str | ProblemId] = (),
+    conf: RunConfigure | None = None,
+    runner: Runner | None = None,
+) -> Iterator[ProblemResult]:
+    """
+    Run problems of given IDs like `7` or `"29.set"`, all if none given, and
+    yield their results as they are solved. Workers of `runner` are used if
+    given, otherwise a runner shared by calls with the same worker settings,
+    which is closed at exit. A runner is busy until the iteration ends.
+    """
+    conf = copy.copy(conf or RunConfigure())
+    conf.id_list = _id_list(ids)
+    if runner is None:
+        runner = _shared_runner(conf)
+
+    if not runner.lock.acquire(blocking=False):
+        raise RuntimeError("Runner is busy with another run")
+
+    yield from _run_locked(conf, runner)
+
+
+async def run_problems_async(
+    ids: Iterable[int | str | ProblemId] = (),
+    conf: RunConfigure | None = None,
+    runner: Runner | None = None,
+) -> AsyncIterator[ProblemResult]:
+    """
+    Run problems like run_problems() in a thread, and yield their results as
+    they are solved without blocking the event loop. A busy runner is waited
+    for, such as one of an iteration stopped but not finished yet.
+    """
+    # asyncio takes longer to import than the rest, only callers need it
+    import asyncio  # pylint: disable=import-outside-toplevel
+
+    loop = asyncio.get_running_loop()
+    conf = copy.copy(conf or RunConfigure())
+    conf.id_list = _id_list(ids)
+    results = asyncio.Queue()
+    stopped = threading.Event()
+    done = object()
+
+    def _post(item: object) -> None:
+        try:
+            loop.call_soon_threadsafe(results.put_nowait, item)
+
+        except RuntimeError:
+            pass  # the event loop is closed
+
+    def _produce() -> None:
+        try:
+            used = runner or _shared_runner(conf)
+            used.lock.acquire()
+            with contextlib.closing(_run_locked(conf, used)) as solved:
+                for result in solved:
+                    if stopped.is_set():
+                        break
+
+                    _post(result)
+
+        except Exception as ex:  # pylint: disable=broad-exception-caught
+            _post(ex)
+
+        _post(done)
+
+    # history and cache are used by the thread which opened them
+    threading.Thread(target=_produce, daemon=True).start()
+    try:
+        while True:
+            item = await results.get()
+            if item is done:
+                break
+
+            if isinstance(item, Exception):
+                raise item
+
+            yield item
+
+    finally:
+        stopped.set()
+
+
+def _any_saved(problems: list[ProblemSolver], key: str) -> bool:
+    """
+    Has any method of problems saved a file of an instrument, by its `key`
+    in extra information of method.
+    """
+    return any(
+        key in method.info
+        for problem in problems
+        for _, method in problem.each_methods()
+    )
+
+
+def do_run(
+    conf: RunConfigure, runner: Runner | None = None, previous: dict | None = None
+):
+    """
+    Run problems, on workers of the given runner which is kept open, such as
+    the one of run server. Time costs of methods are kept in `previous`, and
+    printed next to the new ones of next run.
+    """
+    monitor = None
+    if runner is None:
+        monitor = HostMonitor()
+        monitor.start()
+        runner = _start_runner(conf, monitor)
+        _calibrate(runner, conf)
+        _report_host(monitor, is_tty=sys.stdout.isatty())
+
+    retcode = 0
+    success, count, methods = 0, 0, 0
+    solved_problems = []
+    time_start = datetime.now()
+    is_tty = sys.stdout.isatty()
+    if conf.trace_alloc:
+        print(
+            ClrOut.yellow(
+                "Tracing allocations slows methods down, time costs are not "
+                + "comparable, timeouts are scaled by "
+                + f"{TRACE_ALLOC_TIMEOUT_SCALE:g}",
+                is_tty,
+            )
+        )
+
+    run = ProblemRun(conf, runner)
+    try:
+        show_plan = conf.show_schedule
+        for result in run:
+            if show_plan and run.schedule is not None:
+                print(run.schedule.print_plan())
+                show_plan = False
+
+            problem = result.solver
+            solved_problems.append(problem)
+            if previous is not None:
+                _swap_previous(problem, previous)
+
+            line = problem.print(
+                check=conf.check, strict=conf.strict, is_tty=is_tty, rusage=conf.rusage
+            )
+            print(line)
+            if result.skipped:
+                continue
+
+            if conf.check:
+                if result.correct:
+                    success += 1
+                else:
+                    retcode = 1
+
+            count += 1
+            methods += len(result.methods)
+
+        time_finish = datetime.now()
+        dt = (time_finish - time_start).total_seconds()
+        if conf.check:
+            print(f"Solved {success}/{count} problems in {dt:.3f}s")
+        else:
+            print(f"Solved {count} problems solved in {dt:.3f}s")
+
+        if run.schedule is not None and (
+            conf.jobs > 1 or conf.show_schedule or conf.budget > 0.0
+        ):
+            print(run.schedule.print_summary())
+
+        # methods timed out or skipped save nothing
+        if _any_saved(solved_problems, "profile_path"):
+            print(f"Profiles saved in {conf.profile}")
+
+        if _any_saved(solved_problems, "sample_path"):
+            print(f"Sampled stacks saved in {conf.sample}")
+
+        if _any_saved(solved_problems, "alloc_path"):
+            print(f"Allocation snapshots saved in {conf.trace_alloc}")
+
+        if conf.json:
+            _write_json(conf.json, solved_problems, conf, run.partitioned)
+            print(f"Results saved in {conf.json}")
+
+    except KeyboardInterrupt:
+        if monitor is None:
+            raise  # to the owner of runner
+
+        print("Interrupted by user")
+        retcode = 1
+
+    finally:
+        if monitor is not None:
+            runner.close()
+            monitor.stop()
+
+    sys.exit(retcode)
+
+
+def _swap_previous(problem: ProblemSolver, previous: dict) -> None:
+    for _, method in problem.each_methods():
+        if method.is_run() and method.skipped is None and method.cancelled is None:
+            key = (problem.module_name, method.name)
+            method.previous = previous.get(key)
+            previous[key] = method.time_cost
+
+
+def _watch_stamps() -> dict[str, int | None]:
+    """
+    Modification times of files in problem and data directories.
+    """
+    result = {}
+    for dirname in (PROBLEM_DIR, DATA_DIR):
+        for entry in os.scandir(dirname):
+            if entry.is_file():
+                result[os.path.normpath(entry.path)] = _mtime(entry.path)
+
+    return result
+
+
+def _affected_problems(changed: set[str], id_list: list[ProblemId]) -> list[ProblemId]:
+    """
+    Problems of selection with changed input files, see RunCache.input_files.
+    """
+    found, id_map, _ = _select_problem_files(PROBLEM_DIR, id_list)
+    result = []
+    for module_name, _, pid in found:
+        if not changed.isdisjoint(RunCache.input_files(module_name)):
+            result.append(id_map.get(pid) or ProblemId(pid))
+
+    return result
+
+
+def do_watch(conf: RunConfigure):
+    """
+    Run problems, then keep workers and run again problems whose files
+    change, until interrupted.
+    """
+    monitor = HostMonitor()
+    monitor.start()
+    runner = _start_runner(conf, monitor)
+    runner.reload = True
+    _calibrate(runner, conf)
+    _report_host(monitor, is_tty=sys.stdout.isatty())
+    previous = {}
+    id_list = conf.id_list
+    try:
+        stamps = _watch_stamps()
+        while True:
+            try:
+                do_run(conf, runner=runner, previous=previous)
+
+            except SystemExit:
+                pass
+
+            print(f"Watching {PROBLEM_DIR}/ and {DATA_DIR}/ for changes")
+            conf.id_list = []
+            while len(conf.id_list) == 0:
+                time.sleep(WATCH_INTERVAL)
+                current = _watch_stamps()
+                changed = {
+                    f
+                    for f in stamps.keys() | current.keys()
+                    if stamps.get(f) != current.get(f)
+                }
+                stamps = current
+                if len(changed) > 0:
+                    conf.id_list = _affected_problems(changed, id_list)
+
+    except KeyboardInterrupt:
+        print("Interrupted by user")
+
+    finally:
+        runner.close()
+        monitor.stop()
+
+
+def do_bench(conf: BenchConfigure):
+    """
+    Benchmark problems.
+    """
+    monitor = HostMonitor()
+    monitor.start()
+    runner = _start_runner(conf, monitor)
+    _calibrate(runner, conf)
+    _report_host(monitor, is_tty=sys.stdout.isatty())
+    # time costs measured on other hosts are not comparable to history
+    history = _open_history("bench") if conf.history and not conf.workers else None
+
+    retcode = 0
+    count, methods = 0, 0
+    time_start = datetime.now()
+    is_tty = sys.stdout.isatty()
+    try:
+        problems = find_problem_solvers(
+            PROBLEM_DIR, id_list=conf.id_list, runner=runner, timeout=conf.timeout
+        )
+        for problem in runner.solve_problems(problems, conf):
+            if history is not None:
+                history.record(problem)
+
+            print(problem.print_bench(is_tty=is_tty))
+            count += 1
+            methods += sum(1 for m in problem.methods.values() if m.bench)
+
+        time_finish = datetime.now()
+        dt = (time_finish - time_start).total_seconds()
+        print(f"Benchmarked {methods} methods of {count} problems in {dt:.3f}s")
+
+    except KeyboardInterrupt:
+        print("Interrupted by user")
+        retcode = 1
+
+    finally:
+        runner.close()
+        monitor.stop()
+        if history is not None:
+            history.close()
+
+    sys.exit(retcode)
+
+
+def do_merge(files: list[str], strict: bool = False):
+    """
+    Merge JSON results of runs, such as shards of a run, print them as one
+    report with a single success count.
+    """
+    problems = {}
+    shards = set()
+    # (problem, method) of all shards to their order
+    partitioned = {}
+    for path in files:
+        try:
+            with open(path, encoding="utf-8") as f:
+                content = json.load(f)
+
+        except (OSError, ValueError) as ex:
+            print(f"Failed to read results from {path}: {ex}")
+            sys.exit(1)
+
+        if content.get("shard") is not None:
+            shards.add(tuple(content["shard"]))
+            for pid, name in content["partitioned"] or []:
+                partitioned.setdefault((pid, name), len(partitioned))
+
+        for entry in content["problems"]:
+            if entry["pid"] in problems:
+                _merge_methods(problems[entry["pid"]], entry)
+            else:
+                problems[entry["pid"]] = _problem_from_json(entry)
+
+    is_tty = sys.stdout.isatty()
+    errors = []
+    counts = {count for _, count in shards}
+    if len(counts) > 1:
+        errors.append(f"Shards of {', '.join(f'{n}' for n in sorted(counts))} merged")
+
+    elif len(counts) == 1 and len(shards) < min(counts):
+        errors.append(f"Only {len(shards)} of {min(counts)} shards merged")
+
+    merged = {(pid, name) for pid, p in problems.items() for name in p.methods}
+    missing = sorted(partitioned.keys() - merged)
+    if len(missing) > 0:
+        labels = ", ".join(
+            f"p{pid:04d}.solve" + (f"_{name}" if name else "") for pid, name in missing
+        )
+        errors.append(f"Missing methods of shards: {labels}")
+
+    success, count = 0, 0
+    for pid in sorted(problems):
+        problem = problems[pid]
+        # methods were merged in order of shards
+        problem.order_methods([name for key, name in partitioned if key == pid])
+        print(problem.print(check=True, strict=strict, is_tty=is_tty))
+        if problem.is_skipped():
+            continue
+
+        success += int(problem.is_correct(strict=strict))
+        count += 1
+
+    print(f"Solved {success}/{count} problems in {len(files)} results")
+    for error in errors:
+        print(ClrOut.red(error, is_tty))
+
+    sys.exit(0 if success == count and len(errors) == 0 else 1)
+
+
+def _pool_shape(conf: RunConfigure) -> tuple:
+    """
+    Settings of worker processes, a run server only serves runs of the same,
+    runs without -j use as many workers as the server.
+    """
+    return conf.jobs, conf.backend, conf.pin, conf.nice, conf.workers
+
+
+class _ClientStream:
+    """
+    Standard output of a run on run server, printed lines are sent to client.
+    """
+
+    def __init__(self, conn, is_tty: bool):
+        self.conn = conn
+        self.is_tty = is_tty
+        self.buffer = ""
+
+    def isatty(self) -> bool:
+        """
+        Is standard output of client a terminal, so colors are kept.
+        """
+        return self.is_tty
+
+    def write(self, text: str) -> int:
+        """
+        Buffer text, and send complete lines of it to client.
+        """
+        self.buffer += text
+        if "\n" in self.buffer:
+            lines, self.buffer = self.buffer.rsplit("\n", 1)
+            self.conn.send(("out", f"{lines}\n"))
+
+        return len(text)
+
+    def flush(self) -> None:
+        """
+        Send the rest of buffered text to client.
+        """
+        if self.buffer != "":
+            self.conn.send(("out", self.buffer))
+            self.buffer = ""
+
+
+class RunServer:
+    """
+    Server of runs with warm worker processes, listening on a Unix socket.
+    Problem modules and data stay imported in workers between runs, and are
+    imported again once their files change. `run` uses the server when it is
+    up with the same worker settings.
+    """
+
+    def __init__(
+        self, conf: RunConfigure, path: str = SERVE_SOCKET, key_path: str = SERVE_KEY
+    ):
+        self.conf = conf
+        self.path = path
+        self.key_path = key_path
+        self.runner = None
+        self.monitor = HostMonitor()
+        self.mtime = _mtime(__file__)
+
+    def serve_forever(self) -> None:
+        """
+        Serve runs until stopped or interrupted.
+        """
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        for path in (self.path, self.key_path):
+            if os.path.exists(path):
+                os.remove(path)  # left by a server which did not stop cleanly
+
+        self.runner = _start_runner(self.conf, self.monitor)
+        self.runner.reload = True
+        _calibrate(self.runner, self.conf)
+        self.monitor.start()
+        authkey = os.urandom(32)
+        # socket and key are created private to the user, not changed after
+        umask = os.umask(0o077)
+        try:
+            with open(self.key_path, "wb") as f:
+                f.write(authkey)
+
+            listener = Listener(self.path, family="AF_UNIX", authkey=authkey)
+
+        finally:
+            os.umask(umask)
+
+        try:
+            with listener:
+                print(f"Serving runs on {self.path} with {self.runner.jobs} workers")
+                while self._accept(listener):
+                    pass
+
+        finally:
+            self.runner.close()
+            self.monitor.stop()
+            for path in (self.path, self.key_path):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def _accept(self, listener: Listener) -> bool:
+        """
+        Serve a client, return False if the server should stop.
+        """
+        try:
+            conn = listener.accept()
+
+        except (OSError, multiprocessing.AuthenticationError) as ex:
+            print(f"Rejected client: {ex}")
+            return True
+
+        try:
+            command, argv, is_tty = conn.recv()
+            if command == "stop":
+                conn.send(("exit", 0))
+                return False
+
+            if command != "run":
+                return True
+
+            if _mtime(__file__) != self.mtime:
+                conn.send(("stale", None))
+                return False
+
+            parsed = self._parse(argv)
+            if parsed is None:
+                conn.send(("local", None))
+                return True
+
+            args, conf = parsed
+            if args.jobs is None:
+                conf.jobs = self.conf.jobs
+
+            if args.backend is None:
+                conf.backend = self.conf.backend
+
+            if _pool_shape(conf) != _pool_shape(self.conf):
+                conn.send(("mismatch", None))
+                return True
+
+            print(f"Run {' '.join(argv)}")
+            conn.send(("exit", self._run(conn, conf, is_tty)))
+
+        except (EOFError, OSError) as ex:
+            print(f"Lost client: {ex}")
+
+        finally:
+            conn.close()
+
+        return True
+
+    @staticmethod
+    def _parse(argv: list[str]) -> tuple[argparse.Namespace, RunConfigure] | None:
+        """
+        Parse arguments of a run, None if the run is not for run server, or
+        they are invalid, whose errors the client reports running locally.
+        """
+        # usage and errors are not for the log of run server
+        output = io.StringIO()
+        try:
+            with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+                args = _get_parser().parse_args(argv)
+
+            conf = RunConfigure.from_parser(args)
+
+        except (SystemExit, ValueError):
+            return None
+
+        if args.command != "run" or args.no_serve or args.watch:
+            return None
+
+        return args, conf
+
+    def _run(self, conn, conf: RunConfigure, is_tty: bool) -> int:
+        stream = _ClientStream(conn, is_tty)
+        retcode = 0
+        try:
+            with contextlib.redirect_stdout(stream):
+                do_run(conf, runner=self.runner)
+
+        except SystemExit as ex:
+            retcode = ex.code or 0
+
+        except Exception:  # pylint: disable=broad-exception-caught
+            stream.flush()
+            conn.send(("err", traceback.format_exc()))
+            retcode = 1
+
+        finally:
+            # jobs of a run abandoned by a lost client
+            self.runner.abort()
+
+        stream.flush()
+        return retcode
+
+
+def _exit_on_terminate() -> None:
+    """
+    Exit normally on SIGTERM like on SIGINT, so worker processes are closed
+    with the process. Worker processes forked from it terminate as usual.
+    """
+    main_pid = os.getpid()
+
+    def _on_terminate(signum, frame):
+        if os.getpid() == main_pid:
+            signal.default_int_handler(signum, frame)
+
+        signal.signal(signum, signal.SIG_DFL)
+        os.kill(os.getpid(), signum)
+
+    signal.signal(signal.SIGTERM, _on_terminate)
+
+
+def do_serve(conf: RunConfigure, stop: bool = False):
+    """
+    Serve runs with warm worker processes, or stop the server.
+    """
+    if stop:
+        conn = serve_client("stop", [])
+        if conn is None:
+            print("Run server is not running")
+            sys.exit(1)
+
+        conn.recv()
+        conn.close()
+        print("Run server stopped")
+        return
+
+    if sys.platform == "win32":
+        print("Run server is not supported on Windows")
+        sys.exit(1)
+
+    conn = serve_client("ping", [])
+    if conn is not None:
+        conn.close()
+        print(f"Run server is already running on {SERVE_SOCKET}")
+        sys.exit(1)
+
+    _exit_on_terminate()
+    sys.stdout.reconfigure(line_buffering=True)
+    try:
+        RunServer(conf).serve_forever()
+
+    except KeyboardInterrupt:
+        print("Interrupted by user")
+
+
+def do_worker(address: tuple[str, int], jobs: int, backend: str, authkey: str):
+    """
+    Run a worker agent for runners on other hosts.
+    """
+    if not authkey:
+        print(f"Worker agent requires --authkey or ${AUTHKEY_ENV}")
+        sys.exit(1)
+
+    agent = WorkerAgent(address, authkey.encode(), jobs or usable_cpu_count(), backend)
+    _exit_on_terminate()
+    try:
+        agent.serve_forever()
+
+    except OSError as ex:
+        print(f"Failed to listen on {address[0]}:{address[1]}: {ex}")
+        sys.exit(1)
+
+    except KeyboardInterrupt:
+        print("Interrupted by user")
+
+
+class HistoryConfigure:
+    """
+    History query configuration.
+    """
+
+    kind: str
+    limit: int
+    window: int
+    threshold: float
+    min_delta: float
+    fail_on_regression: bool
+    id_list: Iterable[ProblemId]
+
+    def __init__(self):
+        self.kind = "run"
+        self.limit = 20
+        self.window = 5
+        self.threshold = 0.25
+        self.min_delta = 1.0
+        self.fail_on_regression = False
+        self.id_list = []
+
+    @staticmethod
+    def from_parser(result: argparse.Namespace) -> HistoryConfigure:
+        """
+        Create a history query configuration from parser result.
+        """
+        conf = HistoryConfigure()
+        conf.kind = result.kind
+        conf.limit = result.limit
+        conf.window = result.window
+        conf.threshold = result.threshold
+        conf.min_delta = result.min_delta
+        conf.fail_on_regression = result.fail_on_regression
+        conf.id_list = result.id
+        return conf
+
+
+def _print_method_history(
+    title: str, rows: list[sqlite3.Row], conf: HistoryConfigure, is_tty: bool
+) -> tuple[str, bool]:
+    # noisy time costs would raise false alarms
+    costs = [
+        r["time_cost"]
+        for r in rows
+        if r["status"] in History.SUCCESS_STATUS and not r["noisy"]
+    ]
+    line = [title]
+    if len(costs) == 0:
+        line.append(ClrOut.yellow(" NO SUCCESSFUL RUN", is_tty))
+        return "".join(line), False
+
+    line.append(f" {costs[-1]:10.3f}ms")
+    regression = detect_regression(
+        costs, conf.window, conf.threshold, conf.min_delta
+    )
+    is_regression = False
+    if regression is None:
+        line.append(" " * 24)
+    else:
+        latest, baseline, is_regression = regression
+        change = (latest - baseline) / baseline if baseline > 0.0 else 0.0
+        colour = "red" if is_regression else None
+        line.append(f" base {baseline:10.3f}ms")
+        line.append(ClrOut.write(f" {change:+7.1%}", colour, is_tty))
+
+    line.append(f" {_sparkline(costs)}")
+    if is_regression:
+        line.append(ClrOut.red(" SLOWER", is_tty))
+
+    return "".join(line), is_regression
+
+
+def do_history(conf: HistoryConfigure):
+    """
+    Show timing history of methods, and find regressions.
+    """
+    history = _open_history(conf.kind)
+    if history is None:
+        sys.exit(1)
+
+    is_tty = sys.stdout.isatty()
+    titles = {
+        problem.pid: problem
+        for _, problem in find_problem_solvers(PROBLEM_DIR, id_list=conf.id_list)
+    }
+    pids = {pid.pid for pid in conf.id_list} if conf.id_list else None
+    regressions = 0
+    try:
+        grouped = collections.defaultdict(list)
+        for pid, name in history.methods(pids):
+            grouped[pid].append(name)
+
+        for pid, names in grouped.items():
+            problem = titles.get(pid)
+            title = problem.title if problem is not None else ""
+            header = f"{pid:<5} {title:.<40}"
+            lines = []
+            for name in names:
+                if problem is not None and name in problem.methods:
+                    method_title = problem.methods[name].title
+                else:
+                    method_title = name
+
+                rows = history.timings(pid, name, limit=conf.limit)
+                if len(names) == 1:
+                    line, is_regression = _print_method_history(
+                        header, rows, conf, is_tty
+                    )
+                else:
+                    line, is_regression = _print_method_history(
+                        f"      + {method_title:.<38}", rows, conf, is_tty
+                    )
+
+                regressions += int(is_regression)
+                lines.append(line)
+
+            if len(names) > 1:
+                lines.insert(0, header)
+
+            print("\n".join(lines))
+
+    finally:
+        history.close()
+
+    print(f"Found {regressions} regressions")
+    if conf.fail_on_regression and regressions > 0:
+        sys.exit(1)
+
+
+def main():
+    """
+    Main entry, runs are sent to run server by projeuler.py beforehand.
+    """
+    parser = _get_parser()
+    args = parser.parse_args()
+
+    if args.command == "list":
+        do_list(args.id, args.full)
+
+    elif args.command == "create":
+        do_create(args.id)
+
+    elif args.command == "run":
+        try:
+            conf = RunConfigure.from_parser(args)
+
+        except ValueError as ex:
+            parser.error(str(ex))
+
+        if conf.watch:
+            do_watch(conf)
+        else:
+            do_run(conf)
+
+    elif args.command == "bench":
+        conf = BenchConfigure.from_parser(args)
+        do_bench(conf)
+
+    elif args.command == "history":
+        conf = HistoryConfigure.from_parser(args)
+        do_history(conf)
+
+    elif args.command == "merge":
+        do_merge(args.files, strict=args.strict)
+
+    elif args.command == "serve":
+        conf = RunConfigure()
+        conf.pin = args.pin
+        conf.nice = args.nice
+        conf.jobs = args.jobs or len(conf.pin or []) or usable_cpu_count()
+        conf.backend = args.backend
+        do_serve(conf, stop=args.stop)
+
+    elif args.command == "worker":
+        do_worker(args.listen, args.jobs, args.backend, args.authkey)
+
+    else:
+        parser.print_help()
+